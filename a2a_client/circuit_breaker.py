@@ -0,0 +1,82 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import time
+from a2a_types import A2AClientUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Fails fast once a remote agent keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    are rejected for `reset_timeout` seconds. Then a single trial call is let
+    through: its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def before_request(self):
+        """Raises A2AClientUnavailableError if the call must not be attempted."""
+        if self.state == self.CLOSED:
+            return
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            raise A2AClientUnavailableError(
+                f"{self.name} failed {self.failures} times in a row, "
+                f"retrying in {self.reset_timeout - (now - self.opened_at):.0f}s"
+            )
+        # Lets a single trial call through, and another one after
+        # `reset_timeout` if the trial never completes.
+        self.state = self.HALF_OPEN
+        self.opened_at = now
+
+    def allows_request(self) -> bool:
+        """Whether a call would currently be attempted, without side effects."""
+        return (
+            self.state == self.CLOSED
+            or time.monotonic() - self.opened_at >= self.reset_timeout
+        )
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit of {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"Circuit of {self.name} opened after {self.failures} failures"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
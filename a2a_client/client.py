@@ -14,28 +14,83 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
 import httpx
 import base64
+import random
 from typing import Any, AsyncIterable
 from a2a_types import (
     AgentCard,
     SendTaskRequest,
     SendTaskResponse,
+    GetTaskRequest,
+    GetTaskResponse,
+    CancelTaskRequest,
+    CancelTaskResponse,
     JSONRPCRequest,
+    A2AClientError,
     A2AClientHTTPError,
     A2AClientJSONError,
+    A2AClientUnavailableError,
     SendTaskStreamingResponse,
 )
+from .circuit_breaker import CircuitBreaker
+from . import tracing
 import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Image generation could take time, hence the long read timeout.
+DEFAULT_TIMEOUT = httpx.Timeout(30, connect=5)
+# Status codes of a seller, or of a proxy in front of it, being unavailable.
+UNAVAILABLE_STATUS_CODES = {502, 503, 504}
+# Read-only methods, retried whatever happened to the failed attempt.
+IDEMPOTENT_METHODS = {"tasks/get", "tasks/pushNotification/get"}
+
+
+def is_retryable(method: str, error: Exception) -> bool:
+    """Whether a failed request can be sent again.
+
+    Requests that may have reached the seller are only retried for read-only
+    methods. Others are retried when the seller surely did not process them,
+    the retry then carries the same task id so the seller sees a single task.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        # 503 means the seller turned the request away without processing it.
+        return status_code == 503 or (
+            status_code in UNAVAILABLE_STATUS_CODES and method in IDEMPOTENT_METHODS
+        )
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        # The request was never sent.
+        return True
+    return isinstance(error, httpx.TransportError) and method in IDEMPOTENT_METHODS
 
 
 class A2AClient:
-    def __init__(self, agent_card: AgentCard, auth: str, agent_url: str):
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        auth: str,
+        agent_url: str,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
         # The URL accessed here should be the same as the one provided in the agent card
         # However, in this demo we are using the URL provided in the key arguments
         self.url = agent_url
         # self.url = agent_card.url
         self.auth_header = None
+        self.timeout = timeout
+        # Retries wait a random delay of up to `retry_backoff` seconds, doubled
+        # on every attempt, so that clients do not retry in lockstep.
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(agent_card.name)
+        self._client: httpx.AsyncClient | None = None
 
         if agent_card.authentication:
             if len(agent_card.authentication.schemes) > 1:
@@ -56,31 +111,85 @@ class A2AClient:
         request = SendTaskRequest(params=payload)
         return SendTaskResponse(**await self._send_request(request))
 
+    async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
+        request = GetTaskRequest(params=payload)
+        return GetTaskResponse(**await self._send_request(request))
+
+    async def cancel_task(self, payload: dict[str, Any]) -> CancelTaskResponse:
+        request = CancelTaskRequest(params=payload)
+        return CancelTaskResponse(**await self._send_request(request))
+
     async def send_task_streaming(
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
         raise NotImplementedError("Streaming is not supported for now")
 
+    def _get_client(self) -> httpx.AsyncClient:
+        # Reused across requests to keep the connections to the seller alive.
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+
     async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                # Image generation could take time, adding timeout
-                print(f"Send Remote Agent Task Request: {request.model_dump()}")
-                print("=" * 100)
-                request_kwargs = {
-                    "url": self.url,
-                    "json": request.model_dump(),
-                    "timeout": 30,
-                }
-                if self.auth_header:
-                    request_kwargs["headers"] = {"Authorization": self.auth_header}
-
-                response = await client.post(**request_kwargs)
-                response.raise_for_status()
-                print(f"Send Remote Agent Task Response: {response.json()}")
-                print("=" * 100)
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+        # Fails fast without waiting for a timeout when the seller is down.
+        self.circuit_breaker.before_request()
+        with tracing.start_client_span(
+            f"a2a.client {request.method}",
+            attributes={"a2a.method": request.method, "server.address": self.url},
+        ):
+            payload = request.model_dump()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Send Remote Agent Task Request", extra={"payload": payload}
+                )
+            headers = {}
+            if self.auth_header:
+                headers["Authorization"] = self.auth_header
+            # Propagates the current trace as a W3C traceparent header.
+            tracing.inject_context(headers)
+
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await self._get_client().post(
+                        self.url, json=payload, headers=headers
+                    )
+                    response.raise_for_status()
+                    result = response.json()
+                except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                    if attempt < self.max_retries and is_retryable(request.method, e):
+                        delay = random.uniform(0, self.retry_backoff * 2**attempt)
+                        logger.warning(
+                            f"Retrying {request.method} to {self.url} in {delay:.2f}s after {e!r}"
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+                    raise self._on_failure(e) from e
+                except json.JSONDecodeError as e:
+                    self.circuit_breaker.record_success()
+                    raise A2AClientJSONError(str(e)) from e
+
+                self.circuit_breaker.record_success()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Send Remote Agent Task Response", extra={"payload": result}
+                    )
+                return result
+
+    def _on_failure(self, error: Exception) -> A2AClientError:
+        """Records a failed request and returns the error to raise."""
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            if status_code < 500:
+                # The seller is up, the request itself was rejected.
+                self.circuit_breaker.record_success()
+                return A2AClientHTTPError(status_code, str(error))
+            self.circuit_breaker.record_failure()
+            if status_code not in UNAVAILABLE_STATUS_CODES:
+                return A2AClientHTTPError(status_code, str(error))
+        else:
+            self.circuit_breaker.record_failure()
+        return A2AClientUnavailableError(f"{self.url}: {error!r}")
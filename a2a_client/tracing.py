@@ -0,0 +1,52 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:
+    # Tracing is optional, spans are no-ops when OpenTelemetry is not installed.
+    propagate = None
+    trace = None
+
+TRACER_NAME = "a2a_client"
+
+
+def inject_context(headers: dict[str, str]) -> dict[str, str]:
+    """Adds the current trace context to outgoing request headers."""
+    if propagate is not None:
+        propagate.inject(headers)
+    return headers
+
+
+@contextmanager
+def start_client_span(
+    name: str, attributes: dict[str, Any] | None = None
+) -> Iterator[Any]:
+    """Starts a client span as the current span, a no-op without OpenTelemetry."""
+    if trace is None:
+        yield None
+        return
+
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(
+        name,
+        kind=trace.SpanKind.CLIENT,
+        attributes={k: v for k, v in (attributes or {}).items() if v is not None},
+    ) as span:
+        yield span
@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import chromadb
+from embedding_cache import make_embedding_function
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+# Files picked up when a directory is ingested. JSONL files hold one document per line:
+# {"text": "...", "id": "optional-source-id", "metadata": {...}}
+TEXT_EXTENSIONS = (".txt", ".md")
+JSONL_EXTENSIONS = (".jsonl",)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_OVERLAP = 200
+DEFAULT_BATCH_SIZE = 64
+
+
+def iter_files(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file_name in sorted(files):
+                    if file_name.endswith(TEXT_EXTENSIONS + JSONL_EXTENSIONS):
+                        yield os.path.join(root, file_name)
+        else:
+            yield path
+
+
+def iter_documents(paths: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Streams (text, metadata) pairs from text and JSONL files, one line at a time for JSONL."""
+    for path in iter_files(paths):
+        if path.endswith(JSONL_EXTENSIONS):
+            with open(path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    text = record.get("text") or record.get("document") or ""
+                    metadata = {"source": path, "source_id": str(record.get("id", line_number))}
+                    metadata.update(record.get("metadata") or {})
+                    yield text, metadata
+        else:
+            with open(path, encoding="utf-8") as f:
+                yield f.read(), {"source": path}
+
+
+def check_chunking(chunk_size: int, chunk_overlap: int, batch_size: int) -> Optional[str]:
+    """Returns why the chunking parameters are invalid, or None if they are valid."""
+    if chunk_size < 1 or batch_size < 1:
+        return "chunk_size and batch_size must be at least 1"
+    if not 0 <= chunk_overlap < chunk_size:
+        return "chunk_overlap must be at least 0 and smaller than chunk_size"
+    return None
+
+
+def chunk_text(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE, chunk_overlap: int = DEFAULT_CHUNK_OVERLAP) -> List[str]:
+    """Splits text into chunks of at most chunk_size characters, cut on whitespace when possible."""
+    text = text.strip()
+    if len(text) <= chunk_size:
+        return [text] if text else []
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            # Prefer cutting after the last whitespace of the chunk over splitting a word.
+            cut = text.rfind(" ", start + chunk_size // 2, end)
+            if cut != -1:
+                end = cut
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - chunk_overlap, start + 1)
+    return chunks
+
+
+def content_id(text: str) -> str:
+    # Identical chunks get the same id, so unchanged content is detected and skipped on re-ingestion.
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def ingest(collection, paths: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE, chunk_overlap: int = DEFAULT_CHUNK_OVERLAP, batch_size: int = DEFAULT_BATCH_SIZE, max_batch_size: Optional[int] = None, on_upsert: Optional[Callable[[List[str], List[str]], None]] = None, on_delete: Optional[Callable[[List[str]], None]] = None) -> Dict[str, Any]:
+    """Chunks the documents found under paths and upserts the new chunks into the collection in batches.
+
+    Chunks already in the collection (same content hash id) are skipped, so they are not embedded again.
+    Chunks of the ingested files that are no longer in them are then deleted, so a changed file does not
+    leave its old text behind. Identical chunks are stored once, under the file they were first read from.
+    on_upsert, if given, is called with the ids and documents of each upserted batch, and on_delete with
+    the ids of each deleted batch.
+    Returns ingestion statistics, including the throughput in chunks per second.
+    """
+    if max_batch_size:
+        batch_size = min(batch_size, max_batch_size)
+    stats = {"documents": 0, "chunks": 0, "upserted": 0, "skipped": 0, "deleted": 0}
+    start_time = time.perf_counter()
+    batch: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    # Ids of the chunks read, and files read, to find the chunks the files no longer have.
+    chunk_ids = set()
+    sources = set()
+
+    def flush():
+        ids = list(batch)
+        existing = set(collection.get(ids=ids, include=[])["ids"])
+        new_ids = [chunk_id for chunk_id in ids if chunk_id not in existing]
+        stats["skipped"] += len(ids) - len(new_ids)
+        if new_ids:
+            # A single upsert embeds the whole batch in one call to the embedding function.
+            documents = [batch[chunk_id][0] for chunk_id in new_ids]
+            collection.upsert(ids=new_ids, documents=documents, metadatas=[batch[chunk_id][1] for chunk_id in new_ids])
+            stats["upserted"] += len(new_ids)
+            if on_upsert:
+                on_upsert(new_ids, documents)
+        batch.clear()
+
+    for text, metadata in iter_documents(paths):
+        stats["documents"] += 1
+        sources.add(metadata["source"])
+        for index, chunk in enumerate(chunk_text(text, chunk_size, chunk_overlap)):
+            stats["chunks"] += 1
+            chunk_id = content_id(chunk)
+            chunk_ids.add(chunk_id)
+            if chunk_id in batch:
+                stats["skipped"] += 1
+                continue
+            batch[chunk_id] = (chunk, {**metadata, "chunk": index})
+            if len(batch) >= batch_size:
+                flush()
+    if batch:
+        flush()
+
+    for source in sorted(sources):
+        stale_ids = [chunk_id for chunk_id in collection.get(where={"source": source}, include=[])["ids"] if chunk_id not in chunk_ids]
+        for offset in range(0, len(stale_ids), batch_size):
+            ids = stale_ids[offset:offset + batch_size]
+            collection.delete(ids=ids)
+            stats["deleted"] += len(ids)
+            if on_delete:
+                on_delete(ids)
+
+    stats["seconds"] = round(time.perf_counter() - start_time, 3)
+    stats["chunks_per_second"] = round(stats["chunks"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+    return stats
+
+
+def make_client():
+    # Same configuration as mcp_chroma_server.py.
+    client_type = os.getenv("CHROMA_CLIENT_TYPE", "persistent")
+    if client_type == "http":
+        return chromadb.HttpClient(host=os.getenv("CHROMA_HOST", "localhost"), port=int(os.getenv("CHROMA_PORT", 8000)))
+    if client_type == "persistent":
+        return chromadb.PersistentClient(path=os.getenv("CHROMA_DATA_DIR", "./chroma_data"))
+    raise ValueError(f"Unsupported CHROMA_CLIENT_TYPE for bulk ingestion: {client_type}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk loads text and JSONL files into a ChromaDB collection.")
+    parser.add_argument("paths", nargs="+", help="Files or directories to ingest (.txt, .md and .jsonl files).")
+    parser.add_argument("--collection", required=True, help="The collection to load the documents into, created if missing.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Maximum characters per chunk.")
+    parser.add_argument("--chunk-overlap", type=int, default=DEFAULT_CHUNK_OVERLAP, help="Characters shared by consecutive chunks.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Chunks embedded and upserted per call.")
+    args = parser.parse_args()
+    error = check_chunking(args.chunk_size, args.chunk_overlap, args.batch_size)
+    if error:
+        parser.error(error)
+
+    client = make_client()
+    embedding_function = make_embedding_function(os.getenv("CHROMA_EMBEDDING_CACHE", "./embedding_cache.db"))
+    collection = client.get_or_create_collection(name=args.collection, embedding_function=embedding_function)
+    stats = ingest(collection, args.paths, args.chunk_size, args.chunk_overlap, args.batch_size, client.get_max_batch_size())
+    print(f"Ingested {args.collection}: {stats['documents']} documents, {stats['chunks']} chunks, {stats['upserted']} upserted, {stats['skipped']} unchanged, {stats['deleted']} deleted, in {stats['seconds']}s ({stats['chunks_per_second']} chunks/s)")
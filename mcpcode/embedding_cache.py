@@ -0,0 +1,71 @@
+import hashlib
+import sqlite3
+import threading
+from typing import Any, List
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils import embedding_functions
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Wraps an embedding function with a persistent cache of the vectors, keyed by content hash.
+
+    Texts seen before, by any collection and across restarts, are not embedded again. The cache
+    is a SQLite file, and the key includes the wrapped function name so that changing the model
+    does not return vectors of the old one.
+    """
+
+    def __init__(self, embedding_function: EmbeddingFunction, path: str):
+        self.embedding_function = embedding_function
+        self.lock = threading.Lock()
+        # Called from the executor threads of the MCP server.
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.name()}\0{text}".encode("utf-8")).hexdigest()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [self._key(text) for text in input]
+        with self.lock:
+            cached = {}
+            # Chunked to stay under the SQLite limit of bound parameters.
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self.connection.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                cached.update((key, np.frombuffer(vector, dtype=np.float32)) for key, vector in rows)
+
+        missing = list({key: text for key, text in zip(keys, input) if key not in cached}.items())
+        if missing:
+            # A single call embeds every missing text of the batch.
+            vectors = self.embedding_function([text for _, text in missing])
+            computed = {key: np.asarray(vector, dtype=np.float32) for (key, _), vector in zip(missing, vectors)}
+            with self.lock:
+                self.connection.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", [(key, vector.tobytes()) for key, vector in computed.items()])
+            cached.update(computed)
+        return [cached[key] for key in keys]
+
+    # Chroma checks the embedding function of a collection by name, the cache is transparent to it.
+    def name(self) -> str:
+        return self.embedding_function.name()
+
+    def is_legacy(self) -> bool:
+        # Not registered nor persisted by Chroma, a cache cannot be rebuilt from a config.
+        return True
+
+    def default_space(self):
+        return self.embedding_function.default_space()
+
+    def supported_spaces(self) -> List[Any]:
+        return self.embedding_function.supported_spaces()
+
+
+def make_embedding_function(cache_path: str) -> EmbeddingFunction:
+    """Returns the default embedding function, cached in the SQLite file at cache_path unless it is empty."""
+    embedding_function = embedding_functions.DefaultEmbeddingFunction()
+    if cache_path:
+        embedding_function = CachedEmbeddingFunction(embedding_function, cache_path)
+    return embedding_function
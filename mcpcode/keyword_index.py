@@ -0,0 +1,89 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Letters and digits runs, so "BRG-001" and "brg 001" give the same tokens.
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """An in-memory inverted index of documents scored with BM25.
+
+    Documents are added incrementally, and adding an id again replaces its document. Exact terms
+    such as SKUs and menu item names, which embeddings match loosely, rank first here.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.Lock()
+        # term -> {document id -> term frequency}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        # document id -> its term frequencies, kept to remove the document from the postings
+        self.documents: Dict[str, Counter] = {}
+        self.lengths: Dict[str, int] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, ids: List[str], documents: List[str]):
+        with self.lock:
+            for doc_id, document in zip(ids, documents):
+                self._remove(doc_id)
+                terms = Counter(tokenize(document or ""))
+                self.documents[doc_id] = terms
+                self.lengths[doc_id] = sum(terms.values())
+                self.total_length += self.lengths[doc_id]
+                for term, frequency in terms.items():
+                    self.postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, ids: List[str]):
+        with self.lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        terms = self.documents.pop(doc_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.lengths.pop(doc_id)
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+
+    def search(self, query: str, n_results: int) -> List[Tuple[str, float]]:
+        """Returns up to n_results (id, score) pairs of the documents sharing a term with the query, best first."""
+        with self.lock:
+            if not self.documents:
+                return []
+            document_count = len(self.documents)
+            average_length = self.total_length / document_count or 1
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = frequency + self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / norm
+        return heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Merges ranked id lists, each id scoring the sum of 1 / (k + rank) over the lists it appears in."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -11,8 +11,18 @@ INVALID_PARAMS_CODE = -32602
 
 import chromadb
 from chromadb.utils import embedding_functions
+import bulk_ingest
+from embedding_cache import make_embedding_function
+from keyword_index import BM25Index, reciprocal_rank_fusion
+import asyncio
+import functools
+import json
 import os
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Literal, Union
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -23,6 +33,16 @@ CHROMA_HOST = os.getenv("CHROMA_HOST", "localhost")
 CHROMA_PORT = int(os.getenv("CHROMA_PORT", 8000))
 CHROMA_CLIENT_TYPE = os.getenv("CHROMA_CLIENT_TYPE", "persistent")
 CHROMA_DATA_DIR = os.getenv("CHROMA_DATA_DIR", "./chroma_data")
+# chroma_bulk_ingest only reads files under this directory
+CHROMA_INGEST_DIR = os.path.realpath(os.getenv("CHROMA_INGEST_DIR", "./ingest"))
+# --- MCP Server Configuration ---
+# "sse" serves the legacy SSE endpoints, "streamable-http" a single endpoint at MCP_STREAMABLE_HTTP_PATH
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "sse")
+MCP_HOST = os.getenv("MCP_HOST", "localhost")
+MCP_PORT = int(os.getenv("MCP_PORT", 8001))
+MCP_STREAMABLE_HTTP_PATH = os.getenv("MCP_STREAMABLE_HTTP_PATH", "/mcp")
+# SQLite file caching the embeddings of documents and queries, empty to disable the cache
+CHROMA_EMBEDDING_CACHE = os.getenv("CHROMA_EMBEDDING_CACHE", "./embedding_cache.db")
 
 print(f"ChromaDB configuration: Type={CHROMA_CLIENT_TYPE}, Host={CHROMA_HOST}, Port={CHROMA_PORT}, DataDir={CHROMA_DATA_DIR}")
 
@@ -50,6 +70,164 @@ except Exception as e:
     print(f"Error initializing ChromaDB client: {e}")
     exit(1)
 
+# --- Embedding Function ---
+# Collections embed with the default model, through the embedding cache so that re-ingested
+# documents and repeated queries are not embedded again.
+embedding_function = make_embedding_function(CHROMA_EMBEDDING_CACHE)
+if CHROMA_EMBEDDING_CACHE:
+    print(f"Caching embeddings in {CHROMA_EMBEDDING_CACHE}")
+
+# --- Collection Handle Cache ---
+# get_collection() looks the collection metadata up in SQLite (or over HTTP) on every call,
+# so handles are kept per collection name and dropped when the collection is deleted.
+collection_cache: Dict[str, Any] = {}
+
+def get_cached_collection(collection_name: str):
+    collection = collection_cache.get(collection_name)
+    if collection is None:
+        collection = chroma_client.get_collection(name=collection_name, embedding_function=embedding_function)
+        collection_cache[collection_name] = collection
+    return collection
+
+# --- Query Result Cache ---
+# Results of chroma_query_documents, least recently used first. Each collection has a write version
+# bumped by every add and delete through this server, and part of the cache key, so results cached
+# before a write are never served after it. Writes made by other ChromaDB clients are not seen.
+CHROMA_QUERY_CACHE_SIZE = int(os.getenv("CHROMA_QUERY_CACHE_SIZE", 256))
+query_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+collection_versions: Dict[str, int] = {}
+
+def bump_collection_version(collection_name: str):
+    collection_versions[collection_name] = collection_versions.get(collection_name, 0) + 1
+
+def query_cache_key(collection_name: str, query_texts: List[str], n_results: int, where: Optional[Dict[str, Any]], include: List[str]) -> tuple:
+    return (collection_name, collection_versions.get(collection_name, 0), tuple(query_texts), n_results, json.dumps(where, sort_keys=True), tuple(sorted(include)))
+
+def cache_query_result(key: tuple, result: Any):
+    if CHROMA_QUERY_CACHE_SIZE <= 0:
+        return
+    query_cache[key] = result
+    query_cache.move_to_end(key)
+    while len(query_cache) > CHROMA_QUERY_CACHE_SIZE:
+        query_cache.popitem(last=False)
+
+# --- Keyword Index ---
+# A BM25 index per collection for chroma_hybrid_search, kept in memory. It is loaded from the collection
+# on its first search, then updated by every add and ingestion through this server. Collections written by other
+# ChromaDB clients are not followed; restarting the server reloads them.
+keyword_indexes: Dict[str, BM25Index] = {}
+keyword_index_lock = threading.Lock()
+
+def get_keyword_index(collection) -> BM25Index:
+    with keyword_index_lock:
+        index = keyword_indexes.get(collection.name)
+        if index is None:
+            index = BM25Index()
+            page_size = chroma_client.get_max_batch_size()
+            for offset in range(0, collection.count(), page_size):
+                page = collection.get(include=["documents"], limit=page_size, offset=offset)
+                index.add(page["ids"], page["documents"])
+            keyword_indexes[collection.name] = index
+        return index
+
+def index_documents(collection_name: str, ids: Optional[List[str]], documents: List[str]):
+    with keyword_index_lock:
+        index = keyword_indexes.get(collection_name)
+        if index is None:
+            return  # Not loaded yet, its first search will load these documents too.
+        if ids is None:
+            keyword_indexes.pop(collection_name, None)  # Ids generated by ChromaDB, reloaded on the next search.
+        else:
+            index.add(ids, documents)
+
+def unindex_documents(collection_name: str, ids: List[str]):
+    with keyword_index_lock:
+        index = keyword_indexes.get(collection_name)
+        if index is not None:
+            index.remove(ids)
+
+def reset_keyword_index(collection_name: str, index: Optional[BM25Index] = None):
+    """Replaces the keyword index of a created or deleted collection, None unloads it."""
+    with keyword_index_lock:
+        if index is None:
+            keyword_indexes.pop(collection_name, None)
+        else:
+            keyword_indexes[collection_name] = index
+
+def add_documents(collection, documents: List[str], ids: Optional[List[str]], metadatas: Optional[List[Dict[str, Any]]]):
+    """Adds the documents to the collection, and those with a new id to its keyword index.
+
+    ChromaDB keeps the stored document of an id that already exists, so the keyword index keeps it too.
+    """
+    existing = set(collection.get(ids=ids, include=[])["ids"]) if ids else set()
+    collection.add(documents=documents, ids=ids, metadatas=metadatas)
+    if ids is None:
+        index_documents(collection.name, None, documents)
+    else:
+        new = [(doc_id, document) for doc_id, document in zip(ids, documents) if doc_id not in existing]
+        index_documents(collection.name, [doc_id for doc_id, _ in new], [document for _, document in new])
+
+# --- Query Result Shaping ---
+QUERY_INCLUDE_FIELDS = ["documents", "metadatas", "distances"]
+
+def truncate_document(document: Optional[str], max_chars: Optional[int]) -> Optional[str]:
+    if document is None or not max_chars or len(document) <= max_chars:
+        return document
+    return document[:max_chars] + "…"
+
+def build_query_output(results: Dict[str, Any], offset: int, limit: int, max_document_chars: Optional[int], columnar: bool) -> "ChromaQueryDocumentsOutput":
+    """Keeps the requested page of each query's results, truncates the documents, and flattens the lists if columnar."""
+    page = {field: [hits[offset:offset + limit] for hits in values] for field, values in results.items()}
+    if "documents" in page:
+        page["documents"] = [[truncate_document(document, max_document_chars) for document in hits] for hits in page["documents"]]
+    # Fetched one past the page, so a longer result list means another page exists.
+    has_more = any(len(hits) > offset + limit for hits in results["ids"])
+    next_offset = offset + limit if has_more else None
+    if columnar:
+        query_index = [index for index, hits in enumerate(page["ids"]) for _ in hits]
+        page = {field: [value for hits in values for value in hits] for field, values in page.items()}
+        return ChromaQueryDocumentsOutput(query_index=query_index, next_offset=next_offset, **page)
+    return ChromaQueryDocumentsOutput(next_offset=next_offset, **page)
+
+# --- HNSW Index Tuning ---
+# Presets for the HNSW index of a collection, set through the hnsw:* collection metadata understood by
+# every ChromaDB version. Higher M and ef values find closer neighbours at the cost of latency and memory.
+HNSW_PRESETS = {
+    "latency": {"hnsw:M": 12, "hnsw:construction_ef": 100, "hnsw:search_ef": 20},
+    "balanced": {"hnsw:M": 16, "hnsw:construction_ef": 200, "hnsw:search_ef": 64},
+    "recall": {"hnsw:M": 32, "hnsw:construction_ef": 400, "hnsw:search_ef": 200},
+}
+# Latencies of the latest queries run against each collection, in seconds
+query_latencies: Dict[str, deque] = {}
+
+def record_query_latency(collection_name: str, seconds: float):
+    query_latencies.setdefault(collection_name, deque(maxlen=200)).append(seconds)
+
+def latency_percentiles_ms(collection_name: str) -> Optional[Dict[str, float]]:
+    latencies = sorted(query_latencies.get(collection_name, ()))
+    if not latencies:
+        return None
+    percentile = lambda p: round(latencies[min(int(p / 100 * len(latencies)), len(latencies) - 1)] * 1000, 2)
+    return {"samples": len(latencies), "p50": percentile(50), "p95": percentile(95), "max": round(latencies[-1] * 1000, 2)}
+
+# --- Executor for the synchronous ChromaDB client ---
+# The chromadb client blocks (SQLite, HTTP and the embedding model run in add and query),
+# so its calls run in a bounded thread pool instead of on the event loop serving every SSE session.
+# Each tool also has a cap on its concurrent calls, so embedding-heavy adds cannot take all the threads.
+CHROMA_MAX_WORKERS = int(os.getenv("CHROMA_MAX_WORKERS", 4))
+chroma_executor = ThreadPoolExecutor(max_workers=CHROMA_MAX_WORKERS, thread_name_prefix="chroma")
+tool_semaphores: Dict[str, asyncio.Semaphore] = {
+    "chroma_add_documents": asyncio.Semaphore(int(os.getenv("CHROMA_ADD_CONCURRENCY", 2))),
+    "chroma_query_documents": asyncio.Semaphore(int(os.getenv("CHROMA_QUERY_CONCURRENCY", 4))),
+    "chroma_create_collection": asyncio.Semaphore(1),
+    "chroma_delete_collection": asyncio.Semaphore(1),
+}
+
+async def run_chroma(tool_name: str, func, *args, **kwargs):
+    async with tool_semaphores[tool_name]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(chroma_executor, functools.partial(func, *args, **kwargs))
+
 
 # --- CORRECT FASTMCP INITIALIZATION based on *your provided server.py* ---
 # FastMCP's __init__ takes host and port directly as kwargs for its internal Settings.
@@ -57,8 +235,9 @@ except Exception as e:
 mcp = FastMCP(
     sse_path="/sse",       # Uses sse_path from Settings, as per your server.py
     message_path="/messages/", # Uses message_path from Settings, as per your server.py
-    host="localhost",         # Passed directly to FastMCP, used by its internal settings
-    port=8001               # Passed directly to FastMCP, used by its internal settings
+    streamable_http_path=MCP_STREAMABLE_HTTP_PATH, # Used by the streamable-http transport
+    host=MCP_HOST,         # Passed directly to FastMCP, used by its internal settings
+    port=MCP_PORT          # Passed directly to FastMCP, used by its internal settings
 )
 
 # --- Pydantic Models for Tool Outputs (Input models are flattened into tool arguments) ---
@@ -66,55 +245,185 @@ class ChromaCreateCollectionOutput(BaseModel):
     success: bool
     message: str
 
+class ChromaCollectionStatsOutput(BaseModel):
+    name: str
+    count: int = Field(description="Number of documents in the collection.")
+    index: Dict[str, Any] = Field(description="HNSW index parameters of the collection.")
+    query_latency_ms: Optional[Dict[str, Any]] = Field(None, description="Latency of the latest queries served by this server, cache hits excluded.")
+
 class ChromaAddDocumentsOutput(BaseModel):
     success: bool
     message: str
 
 class ChromaQueryDocumentsOutput(BaseModel):
-    documents: Optional[List[List[str]]] = Field(None, description="A list of lists of retrieved document texts.")
-    ids: Optional[List[List[str]]] = Field(None, description="A list of lists of IDs for the retrieved documents.")
-    metadatas: Optional[List[List[Dict[str, Any]]]] = Field(None, description="A list of lists of metadata dictionaries for the retrieved documents.")
-    distances: Optional[List[List[float]]] = Field(None, description="A list of lists of distances for the retrieved documents.")
+    # Nested lists hold one list per query text; the columnar format flattens them, query_index giving the query of each entry.
+    documents: Optional[Union[List[List[Optional[str]]], List[Optional[str]]]] = Field(None, description="A list of lists of retrieved document texts.")
+    ids: Optional[Union[List[List[str]], List[str]]] = Field(None, description="A list of lists of IDs for the retrieved documents.")
+    metadatas: Optional[Union[List[List[Optional[Dict[str, Any]]]], List[Optional[Dict[str, Any]]]]] = Field(None, description="A list of lists of metadata dictionaries for the retrieved documents.")
+    distances: Optional[Union[List[List[float]], List[float]]] = Field(None, description="A list of lists of distances for the retrieved documents.")
+    query_index: Optional[List[int]] = Field(None, description="Columnar format only: the index of the query text each result belongs to.")
+    next_offset: Optional[int] = Field(None, description="The offset of the next page of results, absent on the last page.")
+
+class ChromaHybridSearchOutput(BaseModel):
+    ids: List[str] = Field(description="IDs of the retrieved documents, best first.")
+    documents: List[Optional[str]] = Field(description="The retrieved document texts.")
+    metadatas: List[Optional[Dict[str, Any]]] = Field(description="The metadata dictionaries of the retrieved documents.")
+    scores: List[float] = Field(description="Reciprocal rank fusion scores, higher is better.")
+    keyword_ranks: List[Optional[int]] = Field(description="Rank of each document in the keyword results, null if it was not among them.")
+    vector_ranks: List[Optional[int]] = Field(description="Rank of each document in the similarity results, null if it was not among them.")
+
+class ChromaBulkIngestOutput(BaseModel):
+    success: bool
+    message: str
+    documents: int = Field(description="Documents read from the files.")
+    chunks: int = Field(description="Chunks the documents were split into.")
+    upserted: int = Field(description="New chunks embedded and stored.")
+    skipped: int = Field(description="Chunks already in the collection, left unchanged.")
+    deleted: int = Field(description="Chunks no longer in the ingested files, deleted.")
+    seconds: float
+    chunks_per_second: float
 
 class ChromaDeleteCollectionOutput(BaseModel):
     success: bool
     message: str
 
 # --- Tool Definitions (corrected to use flattened arguments) ---
-@mcp.tool(name="chroma_create_collection", description="Creates a new collection in ChromaDB. Collections store documents and their embeddings.")
-async def chroma_create_collection(collection_name: str = Field(description="The name of the collection to create."), metadata: Optional[Dict[str, Any]] = Field(None, description="Optional metadata for the collection.")) -> ChromaCreateCollectionOutput:
+@mcp.tool(name="chroma_create_collection", description="Creates a new collection in ChromaDB. Collections store documents and their embeddings. The HNSW index can be tuned with a preset ('latency', 'balanced' or 'recall') and individual parameters, which override the preset.")
+async def chroma_create_collection(collection_name: str = Field(description="The name of the collection to create."), metadata: Optional[Dict[str, Any]] = Field(None, description="Optional metadata for the collection."), space: Optional[Literal["cosine", "l2", "ip"]] = Field(None, description="Optional: The distance function of the index, 'l2' by default."), preset: Optional[Literal["latency", "balanced", "recall"]] = Field(None, description="Optional: HNSW parameters favouring query latency, a balance, or recall."), m: Optional[int] = Field(None, ge=2, description="Optional: HNSW neighbours per node (M), more improves recall and uses more memory."), ef_construction: Optional[int] = Field(None, ge=1, description="Optional: HNSW candidate list size while indexing, more builds a better index more slowly."), ef_search: Optional[int] = Field(None, ge=1, description="Optional: HNSW candidate list size while querying, more improves recall and latency gets worse.")) -> ChromaCreateCollectionOutput:
     if not chroma_client: raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message="ChromaDB client not initialized."))
+    index_metadata = dict(HNSW_PRESETS[preset]) if preset else {}
+    for key, value in (("hnsw:space", space), ("hnsw:M", m), ("hnsw:construction_ef", ef_construction), ("hnsw:search_ef", ef_search)):
+        if value is not None:
+            index_metadata[key] = value
+    metadata = {**(metadata or {}), **index_metadata} or None
     try:
-        chroma_client.create_collection(name=collection_name, metadata=metadata)
+        collection_cache[collection_name] = await run_chroma("chroma_create_collection", chroma_client.create_collection, name=collection_name, metadata=metadata, embedding_function=embedding_function)
+        reset_keyword_index(collection_name, BM25Index())
+        bump_collection_version(collection_name)
         return ChromaCreateCollectionOutput(success=True, message=f"Collection '{collection_name}' created successfully.")
     except Exception as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message=f"Failed to create collection: {e}"))
 
+@mcp.tool(name="chroma_collection_stats", description="Reports the document count, HNSW index parameters and recent query latency of a ChromaDB collection.")
+async def chroma_collection_stats(collection_name: str = Field(description="The name of the collection to report on.")) -> ChromaCollectionStatsOutput:
+    if not chroma_client: raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message="ChromaDB client not initialized."))
+    try:
+        collection = await run_chroma("chroma_query_documents", get_cached_collection, collection_name)
+        count = await run_chroma("chroma_query_documents", collection.count)
+        # Newer ChromaDB versions expose the effective index configuration, older ones only the metadata.
+        configuration = getattr(collection, "configuration", None) or {}
+        index = configuration.get("hnsw") or {key: value for key, value in (collection.metadata or {}).items() if key.startswith("hnsw:")}
+        return ChromaCollectionStatsOutput(name=collection_name, count=count, index=index, query_latency_ms=latency_percentiles_ms(collection_name))
+    except Exception as e:
+        collection_cache.pop(collection_name, None)
+        raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message=f"Failed to get collection stats: {e}"))
+
 @mcp.tool(name="chroma_add_documents", description="Adds documents to an existing ChromaDB collection.")
 async def chroma_add_documents(collection_name: str = Field(description="The name of the collection to add documents to."), documents: List[str] = Field(description="A list of document texts to add."), ids: Optional[List[str]] = Field(None, description="Optional: A list of unique IDs for the documents. If not provided, ChromaDB will generate them."), metadatas: Optional[List[Dict[str, Any]]] = Field(None, description="Optional: A list of metadata dictionaries for each document.")) -> ChromaAddDocumentsOutput:
     if not chroma_client: raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message="ChromaDB client not initialized."))
     try:
-        collection = chroma_client.get_collection(name=collection_name)
-        collection.add(documents=documents, ids=ids, metadatas=metadatas)
+        collection = await run_chroma("chroma_add_documents", get_cached_collection, collection_name)
+        await run_chroma("chroma_add_documents", add_documents, collection, documents, ids, metadatas)
         return ChromaAddDocumentsOutput(success=True, message=f"Added {len(documents)} documents to '{collection_name}'.")
     except Exception as e:
+        # The handle may be stale, e.g. the collection was deleted by another client.
+        collection_cache.pop(collection_name, None)
         raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message=f"Failed to add documents: {e}"))
+    finally:
+        # Bumped once written, a failed add may have written part of the documents.
+        bump_collection_version(collection_name)
 
-@mcp.tool(name="chroma_query_documents", description="Queries documents in a ChromaDB collection based on similarity to a query text.")
-async def chroma_query_documents(collection_name: str = Field(description="The name of the collection to query."), query_texts: List[str] = Field(description="A list of query texts to search for similarity."), n_results: int = Field(5, description="The number of results to return."), where: Optional[Dict[str, Any]] = Field(None, description="Optional: A dictionary for metadata filtering (e.g., {'source': 'article'}).")) -> ChromaQueryDocumentsOutput:
+@mcp.tool(name="chroma_query_documents", description="Queries documents in a ChromaDB collection based on similarity to a query text. Results are paged with offset and n_results; include, max_document_chars and the columnar format keep responses small.")
+async def chroma_query_documents(collection_name: str = Field(description="The name of the collection to query."), query_texts: List[str] = Field(description="A list of query texts to search for similarity."), n_results: int = Field(5, ge=1, description="The number of results to return per query text (the page size)."), where: Optional[Dict[str, Any]] = Field(None, description="Optional: A dictionary for metadata filtering (e.g., {'source': 'article'})."), include: Optional[List[Literal["documents", "metadatas", "distances"]]] = Field(None, description="Optional: The fields to return besides ids, all of them by default."), offset: int = Field(0, ge=0, description="The number of best results to skip, the next_offset of the previous page."), max_document_chars: Optional[int] = Field(None, ge=1, description="Optional: Documents longer than this are cut and end with '…'."), format: Literal["nested", "columnar"] = Field("nested", description="'nested' returns one list per query text, 'columnar' flat lists with a query_index.")) -> ChromaQueryDocumentsOutput:
     if not chroma_client: raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message="ChromaDB client not initialized."))
+    include = QUERY_INCLUDE_FIELDS if include is None else [field for field in QUERY_INCLUDE_FIELDS if field in include]
+    # ChromaDB has no offset, the results up to the end of the page are fetched, plus one telling if there is a next page.
+    fetch_count = offset + n_results + 1
+    # Taken before querying, a write completing meanwhile leaves this result under the old version.
+    cache_key = query_cache_key(collection_name, query_texts, fetch_count, where, include)
+    results = query_cache.get(cache_key)
+    if results is not None:
+        query_cache.move_to_end(cache_key)
+        return build_query_output(results, offset, n_results, max_document_chars, format == "columnar")
     try:
-        collection = chroma_client.get_collection(name=collection_name)
-        results = collection.query(query_texts=query_texts, n_results=n_results, where=where, include=['documents', 'metadatas', 'distances'])
-        return ChromaQueryDocumentsOutput(documents=results.get("documents", []), ids=results.get("ids", []), metadatas=results.get("metadatas", []), distances=results.get("distances", []))
+        collection = await run_chroma("chroma_query_documents", get_cached_collection, collection_name)
+        start_time = time.perf_counter()
+        query_results = await run_chroma("chroma_query_documents", collection.query, query_texts=query_texts, n_results=fetch_count, where=where, include=include)
+        record_query_latency(collection_name, time.perf_counter() - start_time)
+        # Cached before paging and truncation, so those only change the response built from it.
+        results = {field: query_results[field] for field in ["ids", *include]}
+        cache_query_result(cache_key, results)
+        return build_query_output(results, offset, n_results, max_document_chars, format == "columnar")
     except Exception as e:
+        collection_cache.pop(collection_name, None)
         raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message=f"Failed to query documents: {e}"))
 
+@mcp.tool(name="chroma_hybrid_search", description="Searches a ChromaDB collection by keywords (BM25) and by similarity at once, merging both rankings with reciprocal rank fusion. Prefer it to chroma_query_documents for exact terms such as SKUs or menu item names.")
+async def chroma_hybrid_search(collection_name: str = Field(description="The name of the collection to search."), query_text: str = Field(description="The text to search for, by its words and by its meaning."), n_results: int = Field(5, ge=1, description="The number of results to return."), where: Optional[Dict[str, Any]] = Field(None, description="Optional: A dictionary for metadata filtering (e.g., {'source': 'article'})."), rrf_k: int = Field(60, ge=1, description="The reciprocal rank fusion constant, lower values favour the top ranks of each list.")) -> ChromaHybridSearchOutput:
+    if not chroma_client: raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message="ChromaDB client not initialized."))
+    def search():
+        collection = get_cached_collection(collection_name)
+        # The keyword index has no metadata, with a filter more candidates are scored and checked against it.
+        keyword_hits = [doc_id for doc_id, _ in get_keyword_index(collection).search(query_text, n_results * 10 if where else n_results)]
+        if where and keyword_hits:
+            matching = set(collection.get(ids=keyword_hits, where=where, include=[])["ids"])
+            keyword_hits = [doc_id for doc_id in keyword_hits if doc_id in matching]
+        keyword_hits = keyword_hits[:n_results]
+        vector_hits = collection.query(query_texts=[query_text], n_results=n_results, where=where, include=[])["ids"][0]
+        fused = reciprocal_rank_fusion([keyword_hits, vector_hits], rrf_k)[:n_results]
+        found = collection.get(ids=[doc_id for doc_id, _ in fused], include=["documents", "metadatas"]) if fused else {"ids": [], "documents": [], "metadatas": []}
+        return keyword_hits, vector_hits, fused, found
+    try:
+        keyword_hits, vector_hits, fused, found = await run_chroma("chroma_query_documents", search)
+    except Exception as e:
+        collection_cache.pop(collection_name, None)
+        raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message=f"Failed to search documents: {e}"))
+    # get() does not keep the order of the ids.
+    records = {doc_id: (document, metadata) for doc_id, document, metadata in zip(found["ids"], found["documents"], found["metadatas"])}
+    fused = [(doc_id, score) for doc_id, score in fused if doc_id in records]
+    rank = lambda hits, doc_id: hits.index(doc_id) + 1 if doc_id in hits else None
+    return ChromaHybridSearchOutput(
+        ids=[doc_id for doc_id, _ in fused],
+        documents=[records[doc_id][0] for doc_id, _ in fused],
+        metadatas=[records[doc_id][1] for doc_id, _ in fused],
+        scores=[round(score, 6) for _, score in fused],
+        keyword_ranks=[rank(keyword_hits, doc_id) for doc_id, _ in fused],
+        vector_ranks=[rank(vector_hits, doc_id) for doc_id, _ in fused],
+    )
+
+@mcp.tool(name="chroma_bulk_ingest", description="Loads text, markdown and JSONL files into a ChromaDB collection, creating it if needed. Documents are split into chunks, unchanged chunks are skipped and the chunks a file no longer has are deleted, so files can be ingested again after they change.")
+async def chroma_bulk_ingest(collection_name: str = Field(description="The name of the collection to load the documents into."), paths: List[str] = Field(description="Files or directories to ingest, relative to the server ingest directory."), chunk_size: int = Field(bulk_ingest.DEFAULT_CHUNK_SIZE, ge=1, description="Maximum characters per chunk."), chunk_overlap: int = Field(bulk_ingest.DEFAULT_CHUNK_OVERLAP, ge=0, description="Characters shared by consecutive chunks, fewer than chunk_size."), batch_size: int = Field(bulk_ingest.DEFAULT_BATCH_SIZE, ge=1, description="Chunks embedded and stored per batch.")) -> ChromaBulkIngestOutput:
+    if not chroma_client: raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message="ChromaDB client not initialized."))
+    error = bulk_ingest.check_chunking(chunk_size, chunk_overlap, batch_size)
+    if error:
+        raise McpError(ErrorData(code=INVALID_PARAMS_CODE, message=error))
+    resolved_paths = [os.path.realpath(os.path.join(CHROMA_INGEST_DIR, path)) for path in paths]
+    for path in resolved_paths:
+        if os.path.commonpath([path, CHROMA_INGEST_DIR]) != CHROMA_INGEST_DIR or not os.path.exists(path):
+            raise McpError(ErrorData(code=INVALID_PARAMS_CODE, message=f"No such file or directory in the ingest directory: {path}"))
+    try:
+        def ingest():
+            collection = chroma_client.get_or_create_collection(name=collection_name, embedding_function=embedding_function)
+            collection_cache[collection_name] = collection
+            on_upsert = functools.partial(index_documents, collection_name)
+            on_delete = functools.partial(unindex_documents, collection_name)
+            return bulk_ingest.ingest(collection, resolved_paths, chunk_size, chunk_overlap, batch_size, chroma_client.get_max_batch_size(), on_upsert, on_delete)
+        stats = await run_chroma("chroma_add_documents", ingest)
+        return ChromaBulkIngestOutput(success=True, message=f"Ingested {stats['upserted']} new chunks into '{collection_name}', deleted {stats['deleted']} old ones.", **stats)
+    except Exception as e:
+        collection_cache.pop(collection_name, None)
+        raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message=f"Failed to ingest documents: {e}"))
+    finally:
+        bump_collection_version(collection_name)
+
 @mcp.tool(name="chroma_delete_collection", description="Deletes a collection from ChromaDB.")
 async def chroma_delete_collection(collection_name: str = Field(description="The name of the collection to delete.")) -> ChromaDeleteCollectionOutput:
     if not chroma_client: raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message="ChromaDB client not initialized."))
     try:
-        chroma_client.delete_collection(name=collection_name)
+        collection_cache.pop(collection_name, None)
+        reset_keyword_index(collection_name)
+        await run_chroma("chroma_delete_collection", chroma_client.delete_collection, name=collection_name)
+        bump_collection_version(collection_name)
         return ChromaDeleteCollectionOutput(success=True, message=f"Collection '{collection_name}' deleted successfully.")
     except Exception as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR_CODE, message=f"Failed to delete collection: {e}"))
@@ -122,7 +431,10 @@ async def chroma_delete_collection(collection_name: str = Field(description="The
 
 # --- CORRECT WAY TO RUN FastMCP (using its internal run method) ---
 if __name__ == "__main__":
-    print(f"Starting MCP ChromaDB Server on http://{mcp.settings.host}:{mcp.settings.port}")
+    if MCP_TRANSPORT not in ("sse", "streamable-http"):
+        raise ValueError(f"Unsupported MCP_TRANSPORT: {MCP_TRANSPORT}")
+    endpoint = mcp.settings.sse_path if MCP_TRANSPORT == "sse" else mcp.settings.streamable_http_path
+    print(f"Starting MCP ChromaDB Server ({MCP_TRANSPORT}) on http://{mcp.settings.host}:{mcp.settings.port}{endpoint}")
     # Call FastMCP's internal run method and specify the transport
     # The 'run' method in your server.py uses self.settings.host/port directly with uvicorn.
-    mcp.run(transport="sse") # This will internally call uvicorn.run(mcp.app, ...)
\ No newline at end of file
+    mcp.run(transport=MCP_TRANSPORT) # This will internally call uvicorn.run(mcp.app, ...)
\ No newline at end of file
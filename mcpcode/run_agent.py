@@ -1,92 +1,121 @@
+import argparse
 import asyncio
+import time
 from adk_agent import get_chroma_agent
 from google.genai import types
 from google.adk.runners import Runner, RunConfig
 import uuid # For generating unique session_id
-from google.adk.sessions.session import Session
 from google.adk.sessions import InMemorySessionService
-from typing import Any, Iterator # Ensure Iterator is imported for the helper function
- # Import Part for message construction
+from typing import List, Tuple
 
-# Helper function to run a synchronous generator in a separate thread and yield its results asynchronously
-async def _async_yield_from_sync_generator(sync_gen: Iterator[Any]) -> Any:
-    """
-    Wraps a synchronous generator to yield its items asynchronously,
-    running each 'next' call in a separate thread.
-    """
-    while True:
-        try:
-            # We use a helper function to wrap next(sync_gen) so that
-            # StopIteration is caught and a specific signal (None) is returned
-            # instead of raising StopIteration directly in the async context.
-            def _get_next_item():
-                try:
-                    return next(sync_gen)
-                except StopIteration:
-                    return None # Signal end of iteration
-
-            item = await asyncio.to_thread(_get_next_item)
-            if item is None: # Check for our sentinel value
-                break
-            yield item
-        except Exception as e:
-            print(f"Error in sync generator: {e}")
-            raise
-
-async def main():
-    agent, mcp_tool_set, custom_session_service = await get_chroma_agent()
-    if not agent or not mcp_tool_set or not custom_session_service:
-        print("Exiting as ADK agent could not be initialized.")
-        return
-
-    runner = Runner(
-        app_name="ChromaDB_Agent_App", # A descriptive name for your application
-        agent=agent,
-        session_service=custom_session_service # Pass the custom_session_service here
-    )
-    print("ChromaDB ADK Agent is ready. Type 'exit' or 'quit' when prompted by the agent to end the session.")
-
-    user_id = "default_user" # Define a user ID for the session
+APP_NAME = "ChromaDB_Agent_App" # A descriptive name for your application
 
-    inMemSession= await custom_session_service.create_session(
-        app_name="ChromaDB_Agent_App", # The same app name used in Runner
+async def create_session(session_service: InMemorySessionService, user_id: str) -> str:
+    session = await session_service.create_session(
+        app_name=APP_NAME, # The same app name used in Runner
         user_id=user_id, # Use the defined user ID
         state=None, # No initial state needed for this example
         session_id=str(uuid.uuid4()) # Generate a unique session ID
     )
-    session_id =inMemSession.id # Generate a unique session ID for this run
+    return session.id
+
+async def run_prompt(runner: Runner, user_id: str, session_id: str, prompt: str) -> str:
+    """Sends one prompt to the agent and returns the text of its final response."""
+    user_message = types.Content(role="user", parts=[types.Part.from_text(text=prompt)])
+    run_config = RunConfig(response_modalities=["TEXT"])
+    response_parts = []
+    # run_async yields the events on this event loop, no thread is involved per event
+    async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=user_message, run_config=run_config):
+        if event.is_final_response() and event.content and event.content.parts:
+            response_parts.extend(part.text for part in event.content.parts if part.text)
+    return "".join(response_parts)
+
+async def read_input(prompt: str) -> str:
+    # input() blocks, so it waits in a thread and the event loop keeps serving the MCP session meanwhile
+    return await asyncio.to_thread(input, prompt)
+
+async def interactive(runner: Runner, session_service: InMemorySessionService, user_id: str):
+    print("ChromaDB ADK Agent is ready. Type 'exit' or 'quit' when prompted by the agent to end the session.")
+    session_id = await create_session(session_service, user_id)
 
     while True:
-        user_input = input("\nYou: ") # Prompt the user for input
+        try:
+            user_input = await read_input("\nYou: ") # Prompt the user for input
+        except EOFError:
+            break
         if user_input.lower() == 'exit' or user_input.lower() == 'quit':
             break # Exit the loop if user types 'exit' or 'quit'
-
-        user_message = types.Content(role="user", parts=[types.Part.from_text(text=user_input)])
-        run_config = RunConfig(response_modalities=["TEXT"])
-        print(f"[DEBUG] RunConfig: {run_config}")  # Log the configuration
         try:
-            sync_generator_output = runner.run(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=user_message,  # Correct: pass as dict
-                run_config=run_config,  # Pass the RunConfig object
-            )
-
-
-            # Use the helper to consume the synchronous generator asynchronously
-            full_response_parts = []
-            async for response_chunk in _async_yield_from_sync_generator(sync_generator_output):
-                full_response_parts.append(str(response_chunk)) # Convert chunk to string for joining
-            final_response = "".join(full_response_parts)
-            print(f"Agent: {final_response}")
-
+            print(f"Agent: {await run_prompt(runner, user_id, session_id, user_input)}")
         except Exception as e:
             # Catch any exceptions that occur during the interaction process.
             print(f"Agent: An error occurred during interaction: {e}")
-            # This is where the pydantic ValidationError will be caught.
             break # Exit the loop if an unhandled error occurs during interaction
 
+async def batch(runner: Runner, session_service: InMemorySessionService, user_id: str, prompts: List[str], sessions: int):
+    """Runs the prompts across concurrent sessions, and prints the throughput.
+
+    Prompt i goes to session i % sessions. The prompts of a session run in order, since each one
+    sees the history of the previous ones, and the sessions run concurrently.
+    """
+    if not prompts:
+        print("No prompts to run.")
+        return
+    sessions = max(1, min(sessions, len(prompts)))
+    session_ids = [await create_session(session_service, user_id) for _ in range(sessions)]
+    responses: List[Tuple[int, str]] = []
+    latencies: List[float] = []
+
+    async def run_session(session_index: int):
+        for prompt_index in range(session_index, len(prompts), sessions):
+            start_time = time.perf_counter()
+            try:
+                response = await run_prompt(runner, user_id, session_ids[session_index], prompts[prompt_index])
+            except Exception as e:
+                response = f"An error occurred during interaction: {e}"
+            latencies.append(time.perf_counter() - start_time)
+            responses.append((prompt_index, response))
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(run_session(session_index) for session_index in range(sessions)))
+    elapsed = time.perf_counter() - start_time
+
+    for prompt_index, response in sorted(responses):
+        print(f"You: {prompts[prompt_index]}\nAgent: {response}\n")
+    latencies.sort()
+    print(f"{len(prompts)} prompts over {sessions} sessions in {elapsed:.2f}s ({len(prompts) / elapsed:.2f} prompts/s), "
+          f"latency p50 {latencies[len(latencies) // 2]:.2f}s, max {latencies[-1]:.2f}s")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Chat with the ChromaDB ADK agent, or run a file of prompts.")
+    parser.add_argument("--batch", metavar="FILE", help="Runs the prompts of FILE, one per line, instead of prompting interactively.")
+    parser.add_argument("--sessions", type=int, default=1, help="Batch mode: the number of sessions running the prompts concurrently.")
+    args = parser.parse_args()
+
+    chroma_agent = await get_chroma_agent()
+    if not chroma_agent:
+        print("Exiting as ADK agent could not be initialized.")
+        return
+    agent, mcp_tool_set, custom_session_service = chroma_agent
+
+    runner = Runner(
+        app_name=APP_NAME,
+        agent=agent,
+        session_service=custom_session_service # Pass the custom_session_service here
+    )
+    user_id = "default_user" # Define a user ID for the session
+
+    try:
+        if args.batch:
+            with open(args.batch, encoding="utf-8") as f:
+                prompts = [line.strip() for line in f if line.strip()]
+            await batch(runner, custom_session_service, user_id, prompts, args.sessions)
+        else:
+            await interactive(runner, custom_session_service, user_id)
+    finally:
+        # Closes the MCP session kept open across the tool calls of the session
+        await mcp_tool_set.close()
     print("Agent session ended.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
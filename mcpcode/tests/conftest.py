@@ -0,0 +1,59 @@
+import asyncio
+import hashlib
+import importlib
+import os
+import sys
+import uuid
+
+import pytest
+
+# The mcpcode scripts import each other as top-level modules.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def word_hash_embedding_function():
+    """Returns an embedding function hashing the words of texts, so that no model is downloaded."""
+    from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+    class WordHashEmbeddingFunction(EmbeddingFunction[Documents]):
+        def __init__(self):
+            pass
+
+        @staticmethod
+        def name() -> str:
+            return "word_hash"
+
+        def __call__(self, input: Documents) -> Embeddings:
+            embeddings = []
+            for text in input:
+                vector = [0.0] * 16
+                for word in text.lower().split():
+                    vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 16] += 1.0
+                embeddings.append(vector)
+            return embeddings
+
+    return WordHashEmbeddingFunction()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """The Chroma MCP server module, on an in-memory ChromaDB."""
+    pytest.importorskip("chromadb")
+    pytest.importorskip("mcp")
+    monkeypatch.setenv("CHROMA_CLIENT_TYPE", "ephemeral")
+    monkeypatch.setenv("CHROMA_EMBEDDING_CACHE", "")
+    server = importlib.import_module("mcp_chroma_server")
+    monkeypatch.setattr(server, "embedding_function", word_hash_embedding_function())
+    return server
+
+
+@pytest.fixture
+def collection_name(server):
+    """A new collection created through the server, deleted after the test."""
+    collection_name = f"menu-{uuid.uuid4().hex[:8]}"
+    asyncio.run(server.chroma_create_collection(collection_name=collection_name, metadata=None, space=None, preset=None, m=None, ef_construction=None, ef_search=None))
+    yield collection_name
+    server.collection_cache.pop(collection_name, None)
+    server.reset_keyword_index(collection_name)
+    server.chroma_client.delete_collection(name=collection_name)
+
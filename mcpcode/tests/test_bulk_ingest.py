@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from bulk_ingest import check_chunking, chunk_text, content_id, ingest
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents = {}
+        self.upserts = []
+
+    def get(self, include, ids=None, where=None):
+        if where is not None:
+            return {"ids": [doc_id for doc_id, (_, metadata) in self.documents.items() if metadata["source"] == where["source"]]}
+        return {"ids": [doc_id for doc_id in ids if doc_id in self.documents]}
+
+    def delete(self, ids):
+        for doc_id in ids:
+            del self.documents[doc_id]
+
+    def upsert(self, ids, documents, metadatas):
+        self.upserts.append(list(ids))
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self.documents[doc_id] = (document, metadata)
+
+
+def test_short_text_is_a_single_chunk():
+    assert chunk_text("  a short menu  ", chunk_size=100) == ["a short menu"]
+    assert chunk_text("   ", chunk_size=100) == []
+
+
+def test_chunks_are_cut_on_whitespace_and_overlap():
+    text = " ".join(f"word{i:02d}" for i in range(30))
+
+    chunks = chunk_text(text, chunk_size=50, chunk_overlap=10)
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    # Cut after a whole word, the next chunk repeats the end of the previous one.
+    assert all(len(chunk.split()[-1]) == 6 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.split()[-1] in chunk.split()
+    assert " ".join(chunks).split()[-1] == "word29"
+
+
+def test_a_long_word_is_split():
+    chunks = chunk_text("x" * 25, chunk_size=10, chunk_overlap=0)
+
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_content_id_depends_only_on_the_text():
+    assert content_id("cheese burger") == content_id("cheese burger")
+    assert content_id("cheese burger") != content_id("veggie burger")
+    assert len(content_id("cheese burger")) == 32
+
+
+def test_ingest_batches_and_skips_known_chunks(tmp_path):
+    menu = tmp_path / "menu.jsonl"
+    menu.write_text(
+        "\n".join(
+            json.dumps({"id": item, "text": f"{item} burger", "metadata": {"kind": "burger"}})
+            for item in ("classic", "cheese", "veggie", "cheese")
+        )
+    )
+    collection = FakeCollection()
+    upserted = []
+
+    stats = ingest(collection, [str(tmp_path)], batch_size=2, on_upsert=lambda ids, documents: upserted.extend(documents))
+
+    assert stats["documents"] == 4
+    assert stats["upserted"] == 3
+    assert stats["skipped"] == 1
+    assert [len(batch) for batch in collection.upserts] == [2, 1]
+    assert sorted(upserted) == ["cheese burger", "classic burger", "veggie burger"]
+    document, metadata = collection.documents[content_id("veggie burger")]
+    assert metadata == {"source": str(menu), "source_id": "veggie", "kind": "burger", "chunk": 0}
+
+    stats = ingest(collection, [str(menu)], batch_size=2)
+
+    assert stats["upserted"] == 0
+    assert stats["skipped"] == 4
+
+
+
+def test_reingesting_a_changed_file_deletes_its_old_chunks(tmp_path):
+    menu, specials = tmp_path / "menu.txt", tmp_path / "specials.txt"
+    menu.write_text("cheese burger")
+    specials.write_text("fish burger")
+    collection = FakeCollection()
+    ingest(collection, [str(tmp_path)])
+
+    menu.write_text("veggie burger")
+    deleted = []
+    stats = ingest(collection, [str(menu)], on_delete=deleted.extend)
+
+    assert stats["upserted"] == 1
+    assert stats["deleted"] == 1
+    assert deleted == [content_id("cheese burger")]
+    assert sorted(document for document, _ in collection.documents.values()) == ["fish burger", "veggie burger"]
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap, batch_size", [(0, 0, 1), (10, -1, 1), (10, 10, 1), (10, 20, 1), (10, 2, 0)])
+def test_invalid_chunking_is_rejected(chunk_size, chunk_overlap, batch_size):
+    assert check_chunking(chunk_size, chunk_overlap, batch_size) is not None
+
+
+def test_valid_chunking_is_accepted():
+    assert check_chunking(10, 0, 1) is None
+    assert check_chunking(10, 9, 64) is None
+
+
+def test_cli_rejects_an_overlap_as_large_as_the_chunks(tmp_path):
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bulk_ingest.py")
+
+    result = subprocess.run([sys.executable, script, str(tmp_path), "--collection", "menu", "--chunk-size", "10", "--chunk-overlap", "10"], capture_output=True, text=True, cwd=tmp_path)
+
+    assert result.returncode == 2
+    assert "chunk_overlap" in result.stderr
+
+
+def test_tool_rejects_an_overlap_as_large_as_the_chunks(server):
+    from mcp.shared.exceptions import McpError
+
+    with pytest.raises(McpError) as raised:
+        asyncio.run(server.chroma_bulk_ingest(collection_name="menu", paths=["."], chunk_size=10, chunk_overlap=10, batch_size=64))
+
+    assert raised.value.error.code == server.INVALID_PARAMS_CODE
+
+
+def test_tool_arguments_are_bounded(server):
+    from mcp.server.fastmcp.exceptions import ToolError
+
+    with pytest.raises(ToolError, match="chunk_size"):
+        asyncio.run(server.mcp.call_tool("chroma_bulk_ingest", {"collection_name": "menu", "paths": ["."], "chunk_size": 0}))
+
+
+def test_tool_keeps_the_keyword_index_in_step(server, collection_name, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "CHROMA_INGEST_DIR", str(tmp_path))
+    menu = tmp_path / "menu.txt"
+
+    def ingest_menu(text):
+        menu.write_text(text)
+        return asyncio.run(server.chroma_bulk_ingest(collection_name=collection_name, paths=["menu.txt"], chunk_size=100, chunk_overlap=0, batch_size=64))
+
+    ingest_menu("cheese burger")
+    result = ingest_menu("veggie burger")
+
+    assert (result.upserted, result.deleted) == (1, 1)
+    index = server.keyword_indexes[collection_name]
+    assert index.search("cheese", 5) == []
+    assert [doc_id for doc_id, _ in index.search("veggie", 5)] == [content_id("veggie burger")]
@@ -0,0 +1,48 @@
+import asyncio
+
+
+def add(server, collection_name, documents, ids):
+    return asyncio.run(server.chroma_add_documents(collection_name=collection_name, documents=documents, ids=ids, metadatas=None))
+
+
+def search(server, collection_name, query_text):
+    return asyncio.run(server.chroma_hybrid_search(collection_name=collection_name, query_text=query_text, n_results=3, where=None, rrf_k=60))
+
+
+def test_finds_documents_by_their_exact_terms(server, collection_name):
+    add(server, collection_name, ["Classic burger BRG-001", "Cheese burger BRG-002", "Veggie burger BRG-003"], ["classic", "cheese", "veggie"])
+
+    result = search(server, collection_name, "BRG-002")
+
+    assert result.ids[0] == "cheese"
+    assert result.keyword_ranks[0] == 1
+
+
+def test_adding_an_existing_id_keeps_the_indexed_document(server, collection_name):
+    add(server, collection_name, ["Cheese burger"], ["a"])
+    add(server, collection_name, ["Fish burger", "Veggie burger"], ["a", "b"])
+
+    index = server.keyword_indexes[collection_name]
+    assert [doc_id for doc_id, _ in index.search("cheese", 3)] == ["a"]
+    assert index.search("fish", 3) == []
+    assert [doc_id for doc_id, _ in index.search("veggie", 3)] == ["b"]
+
+
+def test_an_unloaded_index_is_loaded_from_the_collection(server, collection_name):
+    add(server, collection_name, ["Pepperoni pizza", "Margherita pizza"], ["pepperoni", "margherita"])
+    server.reset_keyword_index(collection_name)
+
+    result = search(server, collection_name, "pepperoni")
+
+    assert result.ids[0] == "pepperoni"
+    assert len(server.keyword_indexes[collection_name]) == 2
+
+
+def test_deleting_a_collection_drops_its_keyword_index(server, collection_name):
+    add(server, collection_name, ["Cheese burger"], ["a"])
+
+    asyncio.run(server.chroma_delete_collection(collection_name=collection_name))
+    asyncio.run(server.chroma_create_collection(collection_name=collection_name, metadata=None, space=None, preset=None, m=None, ef_construction=None, ef_search=None))
+
+    assert len(server.keyword_indexes[collection_name]) == 0
+    assert search(server, collection_name, "cheese").ids == []
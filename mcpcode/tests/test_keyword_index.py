@@ -0,0 +1,60 @@
+from keyword_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+def test_tokenize_splits_on_punctuation_and_lowercases():
+    assert tokenize("BRG-001, Cheese Burger") == ["brg", "001", "cheese", "burger"]
+
+
+def test_exact_terms_rank_first():
+    index = BM25Index()
+    index.add(
+        ["classic", "cheese", "veggie"],
+        [
+            "Classic burger with beef",
+            "Cheese burger BRG-002 with cheddar cheese",
+            "Veggie burger with beans",
+        ],
+    )
+
+    hits = index.search("cheese", 3)
+
+    assert [doc_id for doc_id, _ in hits] == ["cheese"]
+    assert index.search("burger", 2)[0][1] > 0
+    assert index.search("pizza", 3) == []
+
+
+def test_adding_an_id_again_replaces_its_document():
+    index = BM25Index()
+    index.add(["a", "b"], ["margherita pizza", "pepperoni pizza"])
+    index.add(["a"], ["hawaiian pizza"])
+
+    assert len(index) == 2
+    assert index.search("margherita", 5) == []
+    assert [doc_id for doc_id, _ in index.search("hawaiian", 5)] == ["a"]
+    assert index.total_length == 4
+
+
+def test_removed_documents_are_no_longer_found():
+    index = BM25Index()
+    index.add(["a", "b"], ["margherita pizza", "pepperoni pizza"])
+    index.remove(["a", "missing"])
+
+    assert len(index) == 1
+    assert index.search("margherita", 5) == []
+    assert "margherita" not in index.postings
+
+
+def test_rare_terms_weigh_more():
+    index = BM25Index()
+    index.add(["a", "b", "c"], ["pizza dough", "pizza sauce", "pizza basil"])
+
+    scores = dict(index.search("pizza basil", 3))
+
+    assert scores["c"] > scores["a"] == scores["b"]
+
+
+def test_reciprocal_rank_fusion_favours_ids_ranked_by_both():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b", "d"]], k=1)
+
+    assert [doc_id for doc_id, _ in fused] == ["c", "b", "a", "d"]
+    assert dict(fused)["b"] == 1 / 3 + 1 / 3
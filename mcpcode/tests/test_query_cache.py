@@ -0,0 +1,61 @@
+import asyncio
+
+
+def query(server, collection_name, query_text, n_results=2):
+    return asyncio.run(server.chroma_query_documents(collection_name=collection_name, query_texts=[query_text], n_results=n_results, where=None, include=None, offset=0, max_document_chars=None, format="nested"))
+
+
+def add(server, collection_name, documents, ids):
+    return asyncio.run(server.chroma_add_documents(collection_name=collection_name, documents=documents, ids=ids, metadatas=None))
+
+
+def test_key_changes_with_the_collection_version(server):
+    key = server.query_cache_key("menu", ["burger"], 3, {"kind": "burger"}, ["documents", "distances"])
+
+    assert key == server.query_cache_key("menu", ["burger"], 3, {"kind": "burger"}, ["distances", "documents"])
+    server.bump_collection_version("menu")
+    assert key != server.query_cache_key("menu", ["burger"], 3, {"kind": "burger"}, ["documents", "distances"])
+
+
+def test_cache_keeps_the_most_recently_used_results(server, monkeypatch):
+    monkeypatch.setattr(server, "CHROMA_QUERY_CACHE_SIZE", 2)
+    monkeypatch.setattr(server, "query_cache", type(server.query_cache)())
+
+    server.cache_query_result(("a",), 1)
+    server.cache_query_result(("b",), 2)
+    server.query_cache.move_to_end(("a",))
+    server.cache_query_result(("c",), 3)
+
+    assert list(server.query_cache) == [("a",), ("c",)]
+
+
+def test_repeated_queries_are_served_from_the_cache(server, collection_name, monkeypatch):
+    add(server, collection_name, ["Cheese burger"], ["cheese"])
+    query(server, collection_name, "cheese burger")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("queried ChromaDB again")
+
+    monkeypatch.setattr(server.collection_cache[collection_name], "query", fail)
+    result = query(server, collection_name, "cheese burger")
+
+    assert result.ids == [["cheese"]]
+
+
+def test_adding_documents_invalidates_cached_results(server, collection_name):
+    add(server, collection_name, ["Cheese burger"], ["cheese"])
+    assert query(server, collection_name, "burger").ids == [["cheese"]]
+
+    add(server, collection_name, ["Veggie burger"], ["veggie"])
+
+    assert sorted(query(server, collection_name, "burger").ids[0]) == ["cheese", "veggie"]
+
+
+def test_deleting_a_collection_invalidates_cached_results(server, collection_name):
+    add(server, collection_name, ["Cheese burger"], ["cheese"])
+    query(server, collection_name, "burger")
+
+    asyncio.run(server.chroma_delete_collection(collection_name=collection_name))
+    asyncio.run(server.chroma_create_collection(collection_name=collection_name, metadata=None, space=None, preset=None, m=None, ef_construction=None, ef_search=None))
+
+    assert query(server, collection_name, "burger").ids == [[]]
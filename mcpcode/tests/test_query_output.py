@@ -0,0 +1,59 @@
+# build_query_output shapes results already fetched, no collection is queried here.
+
+RESULTS = {
+    "ids": [["a", "b", "c"], ["d"]],
+    "documents": [["cheese burger", "veggie burger", "fish burger"], ["margherita pizza"]],
+    "metadatas": [[{"kind": "burger"}, {"kind": "burger"}, {"kind": "burger"}], [{"kind": "pizza"}]],
+    "distances": [[0.1, 0.2, 0.3], [0.4]],
+}
+
+
+def test_nested_output_keeps_one_list_per_query(server):
+    output = server.build_query_output(RESULTS, 0, 2, None, False)
+
+    assert output.ids == [["a", "b"], ["d"]]
+    assert output.distances == [[0.1, 0.2], [0.4]]
+    assert output.query_index is None
+    # The first query has a third result, fetched to tell that a next page exists.
+    assert output.next_offset == 2
+
+
+def test_columnar_output_flattens_the_lists(server):
+    output = server.build_query_output(RESULTS, 0, 2, None, True)
+
+    assert output.ids == ["a", "b", "d"]
+    assert output.documents == ["cheese burger", "veggie burger", "margherita pizza"]
+    assert output.metadatas == [{"kind": "burger"}, {"kind": "burger"}, {"kind": "pizza"}]
+    assert output.query_index == [0, 0, 1]
+
+
+def test_last_page_has_no_next_offset(server):
+    output = server.build_query_output(RESULTS, 2, 2, None, False)
+
+    assert output.ids == [["c"], []]
+    assert output.next_offset is None
+
+
+def test_offset_past_the_end_returns_empty_pages(server):
+    nested = server.build_query_output(RESULTS, 10, 2, None, False)
+    columnar = server.build_query_output(RESULTS, 10, 2, None, True)
+
+    assert nested.ids == [[], []]
+    assert nested.next_offset is None
+    assert columnar.ids == [] and columnar.query_index == []
+
+
+def test_fields_not_included_are_left_out(server):
+    results = {"ids": RESULTS["ids"], "distances": RESULTS["distances"]}
+
+    output = server.build_query_output(results, 0, 5, None, True)
+
+    assert output.documents is None
+    assert output.metadatas is None
+    assert output.distances == [0.1, 0.2, 0.3, 0.4]
+
+
+def test_long_documents_are_truncated(server):
+    output = server.build_query_output(RESULTS, 0, 1, 6, False)
+
+    assert output.documents == [["cheese…"], ["marghe…"]]
@@ -15,5 +15,6 @@ limitations under the License.
 """
 
 from . import agent
+from .agent import get_purchasing_agent, get_root_agent
 
-__all__ = ["agent"]
+__all__ = ["agent", "get_purchasing_agent", "get_root_agent"]
@@ -14,15 +14,43 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from .purchasing_agent import PurchasingAgent
-from dotenv import load_dotenv
+from functools import cache
 import os
 
-load_dotenv()
 
-root_agent = PurchasingAgent(
-    remote_agent_addresses=[
-        os.getenv("PIZZA_SELLER_AGENT_URL", "http://localhost:10000"),
-        os.getenv("BURGER_SELLER_AGENT_URL", "http://localhost:10001"),
-    ]
-).create_agent()
+@cache
+def get_purchasing_agent():
+    """Builds the purchasing agent on first use.
+
+    Building it loads the environment and fetches the agent cards of the remote
+    sellers, so it is deferred until the agent is actually needed instead of
+    happening when the package is imported.
+    """
+    # Deferred, google.adk and httpx take seconds to import.
+    from .purchasing_agent import PurchasingAgent
+    from .tracing import setup_tracing
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    setup_tracing()
+
+    return PurchasingAgent(
+        remote_agent_addresses=[
+            os.getenv("PIZZA_SELLER_AGENT_URL", "http://localhost:10000"),
+            os.getenv("BURGER_SELLER_AGENT_URL", "http://localhost:10001"),
+        ],
+        max_prompt_turns=int(os.getenv("MAX_PROMPT_TURNS", "6")),
+    )
+
+
+@cache
+def get_root_agent():
+    """Builds the ADK agent of the purchasing agent on first use."""
+    return get_purchasing_agent().create_agent()
+
+
+def __getattr__(name: str):
+    # `adk web` and `adk run` read `root_agent` as a module attribute.
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
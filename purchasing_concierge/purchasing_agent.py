@@ -14,7 +14,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
 import json
+import logging
 import uuid
 from typing import List
 import httpx
@@ -25,6 +27,7 @@ from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools.tool_context import ToolContext
 from .remote_agent_connection import RemoteAgentConnections, TaskUpdateCallback
+from .session_compaction import compact_llm_request
 from a2a_client.card_resolver import A2ACardResolver
 from a2a_types import (
     AgentCard,
@@ -34,8 +37,11 @@ from a2a_types import (
     TaskSendParams,
     TextPart,
     Part,
+    A2AClientUnavailableError,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class PurchasingAgent:
     """The purchasing agent.
@@ -48,28 +54,47 @@ class PurchasingAgent:
         self,
         remote_agent_addresses: List[str],
         task_callback: TaskUpdateCallback | None = None,
+        max_prompt_turns: int = 6,
     ):
         self.task_callback = task_callback
+        # Number of most recent conversation turns sent verbatim to the model,
+        # older turns are folded into a summary.
+        self.max_prompt_turns = max_prompt_turns
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         for address in remote_agent_addresses:
-            card_resolver = A2ACardResolver(address)
-            try:
-                card = card_resolver.get_agent_card()
-                # The URL accessed here should be the same as the one provided in the agent card
-                # However, in this demo we are using the URL provided in the key arguments
-                remote_connection = RemoteAgentConnections(
-                    agent_card=card, agent_url=address
-                )
-                self.remote_agent_connections[card.name] = remote_connection
-                self.cards[card.name] = card
-            except httpx.ConnectError:
-                print(f"ERROR: Failed to get agent card from : {address}")
+            # An address may list the replicas of a seller separated by commas.
+            replica_urls = [url.strip() for url in address.split(",") if url.strip()]
+            card = None
+            for url in replica_urls:
+                try:
+                    card = A2ACardResolver(url).get_agent_card()
+                    break
+                except httpx.ConnectError:
+                    logger.error(f"Failed to get agent card from : {url}")
+            if card is None:
+                continue
+            # The URL accessed here should be the same as the one provided in the agent card
+            # However, in this demo we are using the URL provided in the key arguments
+            remote_connection = RemoteAgentConnections(
+                agent_card=card, agent_url=replica_urls
+            )
+            self.remote_agent_connections[card.name] = remote_connection
+            self.cards[card.name] = card
         agent_info = []
         for ra in self.list_remote_agents():
             agent_info.append(json.dumps(ra))
         self.agents = "\n".join(agent_info)
 
+    async def cancel_session_tasks(self, session_id: str):
+        """Cancels the tasks the remote agents are still working on for a session."""
+        await asyncio.gather(
+            *(
+                connection.cancel_session_tasks(session_id)
+                for connection in self.remote_agent_connections.values()
+            )
+        )
+
     def create_agent(self) -> Agent:
         return Agent(
             model="gemini-2.0-flash-001",
@@ -130,6 +155,7 @@ Current active seller agent: {current_agent["active_agent"]}
             if "session_id" not in state:
                 state["session_id"] = str(uuid.uuid4())
             state["session_active"] = True
+        compact_llm_request(llm_request, self.max_prompt_turns)
 
     def list_remote_agents(self):
         """List the available remote agents you can use to delegate the task."""
@@ -138,8 +164,9 @@ Current active seller agent: {current_agent["active_agent"]}
 
         remote_agent_info = []
         for card in self.cards.values():
-            print(f"Found agent card: {card.model_dump()}")
-            print("=" * 100)
+            logger.info(f"Found agent card: {card.name}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Agent card", extra={"payload": card.model_dump()})
             remote_agent_info.append(
                 {"name": card.name, "description": card.description}
             )
@@ -193,7 +220,14 @@ Current active seller agent: {current_agent["active_agent"]}
             # pushNotification=None,
             metadata={"conversation_id": sessionId},
         )
-        task = await client.send_task(request, self.task_callback)
+        try:
+            task = await client.send_task(request, self.task_callback)
+        except A2AClientUnavailableError as e:
+            logger.warning(f"Seller agent {agent_name} is unavailable: {e}")
+            return [
+                f"The seller agent {agent_name} is unavailable at the moment, "
+                "please try again later."
+            ]
         # Assume completion unless a state returns that isn't complete
         state["session_active"] = task.status.state not in [
             TaskState.COMPLETED,
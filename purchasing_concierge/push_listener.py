@@ -0,0 +1,93 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+import os
+from urllib.parse import urlparse
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+
+from a2a_client.push_notification_auth import PushNotificationReceiverAuth
+from a2a_types import Task
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class PushNotificationListener:
+    """Receives the push notifications of the seller agents.
+
+    Tasks awaited by the concierge subscribe to their updates, a verified push
+    notification stores the pushed task and wakes up its waiter.
+    """
+
+    def __init__(self, url: str | None):
+        # The URL the sellers send push notifications to, None disables them.
+        self.url = url
+        self.path = (urlparse(url).path or "/") if url else None
+        self.waiters: dict[str, tuple[asyncio.Event, PushNotificationReceiverAuth]] = {}
+        self.updates: dict[str, Task] = {}
+        self.auths: dict[str, PushNotificationReceiverAuth] = {}
+
+    async def subscribe(self, task_id: str, agent_url: str) -> asyncio.Event:
+        """Returns an event set when a push notification arrives for the task."""
+        jwks_url = agent_url.rstrip("/") + "/.well-known/jwks.json"
+        auth = self.auths.get(jwks_url)
+        if auth is None:
+            auth = PushNotificationReceiverAuth()
+            await auth.load_jwks(jwks_url)
+            self.auths[jwks_url] = auth
+        event = asyncio.Event()
+        self.waiters[task_id] = (event, auth)
+        return event
+
+    def unsubscribe(self, task_id: str):
+        self.waiters.pop(task_id, None)
+        self.updates.pop(task_id, None)
+
+    def pop_update(self, task_id: str) -> Task | None:
+        return self.updates.pop(task_id, None)
+
+    async def handle_request(self, request: Request) -> Response:
+        if request.method == "GET":
+            # Sellers check that the URL is ours before sending notifications.
+            validation_token = request.query_params.get("validationToken")
+            if not validation_token:
+                return Response(status_code=400)
+            return PlainTextResponse(validation_token)
+
+        data = await request.json()
+        waiter = self.waiters.get(data.get("id"))
+        if waiter is None:
+            return Response(status_code=404)
+        event, auth = waiter
+        try:
+            if not await auth.verify_push_notification(request):
+                return Response(status_code=401)
+        except Exception as e:
+            logger.warning(f"Invalid push notification: {e}")
+            return Response(status_code=401)
+
+        self.updates[data["id"]] = Task(**data)
+        event.set()
+        return Response(status_code=200)
+
+
+PUSH_LISTENER = PushNotificationListener(os.getenv("PUSH_NOTIFICATION_URL"))
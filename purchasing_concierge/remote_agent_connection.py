@@ -14,21 +14,39 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Callable
+from collections import OrderedDict, deque
+from typing import Callable, List
+import asyncio
+import logging
+import math
+import random
+import time
 import uuid
+import httpx
 from a2a_types import (
+    A2AClientError,
     AgentCard,
+    CancelTaskResponse,
+    GetTaskResponse,
+    PushNotificationConfig,
     Task,
+    TaskIdParams,
+    TaskQueryParams,
     TaskSendParams,
+    TaskState,
     TaskStatusUpdateEvent,
     TaskArtifactUpdateEvent,
 )
 from a2a_client.client import A2AClient
+from a2a_client.circuit_breaker import CircuitBreaker
+from .push_listener import PUSH_LISTENER
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
@@ -36,39 +54,209 @@ KNOWN_AUTH = {
     "pizza_seller_agent": os.getenv("PIZZA_SELLER_AGENT_AUTH", "api_key"),
     "burger_seller_agent": os.getenv("BURGER_SELLER_AGENT_AUTH", "user:pass"),
 }
+# Timeouts of the requests to the seller agents, in seconds.
+A2A_CONNECT_TIMEOUT = float(os.getenv("A2A_CONNECT_TIMEOUT", "5"))
+A2A_READ_TIMEOUT = float(os.getenv("A2A_READ_TIMEOUT", "30"))
+A2A_MAX_RETRIES = int(os.getenv("A2A_MAX_RETRIES", "2"))
+# A seller failing this many requests in a row is reported unavailable without
+# being called for the reset timeout, in seconds.
+A2A_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("A2A_CIRCUIT_FAILURE_THRESHOLD", "5"))
+A2A_CIRCUIT_RESET_TIMEOUT = float(os.getenv("A2A_CIRCUIT_RESET_TIMEOUT", "30"))
+# A `tasks/get` slower than this percentile of the recent ones is sent again to
+# another replica, the first answer wins. Unset to disable hedging.
+A2A_HEDGE_PERCENTILE = (
+    float(os.environ["A2A_HEDGE_PERCENTILE"])
+    if os.getenv("A2A_HEDGE_PERCENTILE")
+    else None
+)
+# Sellers run tasks in the background instead of holding the request open, the
+# concierge then polls them or waits for their push notifications.
+A2A_ASYNC_TASKS = os.getenv("A2A_ASYNC_TASKS", "false").lower() == "true"
+# Polling starts at the initial interval and slows down to the max interval, in
+# seconds. Tasks still working after the timeout are returned as they are.
+A2A_POLL_INITIAL_INTERVAL = float(os.getenv("A2A_POLL_INITIAL_INTERVAL", "0.5"))
+A2A_POLL_MAX_INTERVAL = float(os.getenv("A2A_POLL_MAX_INTERVAL", "5"))
+A2A_TASK_TIMEOUT = float(os.getenv("A2A_TASK_TIMEOUT", "300"))
+# Tasks remembered per seller to send their follow-ups to the same replica.
+MAX_TASK_AFFINITIES = 1000
+# Sessions remembered per seller to send their next tasks to the same replica.
+MAX_SESSION_AFFINITIES = 1000
+TERMINAL_STATES = {TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED}
+ACTIVE_STATES = {TaskState.SUBMITTED, TaskState.WORKING}
+
+
+class Replica:
+    """One replica of a remote agent, with its own client and circuit breaker."""
+
+    def __init__(self, client: A2AClient):
+        self.client = client
+        # Requests sent to the replica and not answered yet.
+        self.outstanding = 0
+
+
+class LatencyTracker:
+    """Keeps the latest latencies to estimate their percentiles."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Returns None until enough latencies were recorded."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = math.ceil(percentile / 100 * len(ordered)) - 1
+        return ordered[min(max(index, 0), len(ordered) - 1)]
 
 
 class RemoteAgentConnections:
-    """A class to hold the connections to the remote agents."""
+    """A class to hold the connections to the remote agents.
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
+    A remote agent may be served by several replicas. The first task of a
+    session is sent to the least busy of two random replicas. The later tasks
+    of the session go to the same replica, since the sellers keep the
+    conversation in memory by session id, and so do the requests about a task.
+    """
+
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str | List[str],
+        hedge_percentile: float | None = A2A_HEDGE_PERCENTILE,
+        async_tasks: bool = A2A_ASYNC_TASKS,
+    ):
         auth = KNOWN_AUTH.get(agent_card.name, None)
-        self.agent_client = A2AClient(agent_card, auth=auth, agent_url=agent_url)
+        agent_urls = [agent_url] if isinstance(agent_url, str) else agent_url
+        self.replicas = [
+            Replica(
+                A2AClient(
+                    agent_card,
+                    auth=auth,
+                    agent_url=url,
+                    timeout=httpx.Timeout(
+                        A2A_READ_TIMEOUT, connect=A2A_CONNECT_TIMEOUT
+                    ),
+                    max_retries=A2A_MAX_RETRIES,
+                    circuit_breaker=CircuitBreaker(
+                        f"{agent_card.name} ({url})",
+                        failure_threshold=A2A_CIRCUIT_FAILURE_THRESHOLD,
+                        reset_timeout=A2A_CIRCUIT_RESET_TIMEOUT,
+                    ),
+                )
+            )
+            for url in agent_urls
+        ]
         self.card = agent_card
+        self.task_replicas: OrderedDict[str, Replica] = OrderedDict()
+        self.session_replicas: OrderedDict[str, Replica] = OrderedDict()
+        self.hedge_percentile = hedge_percentile
+        self.async_tasks = async_tasks
+        self.get_task_latency = LatencyTracker()
 
         self.conversation_name = None
         self.conversation = None
-        self.pending_tasks = set()
+        # Unfinished tasks by session id, cancelled when the session ends.
+        self.session_tasks: dict[str, set[str]] = {}
 
     def get_agent(self) -> AgentCard:
         return self.card
 
+    def _pick_replica(
+        self,
+        task_id: str | None = None,
+        exclude: Replica | None = None,
+        session_id: str | None = None,
+    ) -> Replica:
+        """Returns the replica of the task or of its session, or a replica by
+        power of two choices."""
+        for replica in (
+            self.task_replicas.get(task_id),
+            self.session_replicas.get(session_id),
+        ):
+            if replica is not None and replica.client.circuit_breaker.allows_request():
+                return replica
+        candidates = [
+            replica
+            for replica in self.replicas
+            if replica is not exclude
+            and replica.client.circuit_breaker.allows_request()
+        ]
+        if not candidates:
+            # Let the circuit breaker report the seller as unavailable.
+            return exclude or random.choice(self.replicas)
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+    def _remember_replica(self, task_id: str, session_id: str, replica: Replica):
+        if len(self.replicas) == 1:
+            return
+        for affinities, key, max_affinities in (
+            (self.task_replicas, task_id, MAX_TASK_AFFINITIES),
+            (self.session_replicas, session_id, MAX_SESSION_AFFINITIES),
+        ):
+            affinities[key] = replica
+            affinities.move_to_end(key)
+            if len(affinities) > max_affinities:
+                affinities.popitem(last=False)
+
     async def send_task(
         self,
         request: TaskSendParams,
         task_callback: TaskUpdateCallback | None,
     ) -> Task | None:
-        response = await self.agent_client.send_task(request.model_dump())
-        merge_metadata(response.result, request)
+        replica = self._pick_replica(request.id, session_id=request.sessionId)
+        # Remembered before sending, so that a cancellation of the task while
+        # the request is in flight goes to the replica running it.
+        self._remember_replica(request.id, request.sessionId, replica)
+        self.session_tasks.setdefault(request.sessionId, set()).add(request.id)
+        payload = request.model_dump()
+        push_event = None
+        if self.async_tasks:
+            payload["metadata"] = {**(payload["metadata"] or {}), "blocking": False}
+            if PUSH_LISTENER.url:
+                payload["pushNotification"] = PushNotificationConfig(
+                    url=PUSH_LISTENER.url
+                ).model_dump()
+                # Subscribed before sending, the seller may finish before it
+                # answers the request.
+                push_event = await PUSH_LISTENER.subscribe(
+                    request.id, replica.client.url
+                )
+        task = None
+        try:
+            replica.outstanding += 1
+            try:
+                response = await replica.client.send_task(payload)
+            finally:
+                replica.outstanding -= 1
+            task = response.result
+            if task is not None and task.status.state in ACTIVE_STATES:
+                task = await self.wait_for_task(task.id, push_event)
+        finally:
+            if push_event is not None:
+                PUSH_LISTENER.unsubscribe(request.id)
+            # A send that failed or was cancelled may have started the task,
+            # it stays listed until the end of the session cancels it.
+            if task is not None and task.status.state in TERMINAL_STATES:
+                self._forget_session_task(request.sessionId, request.id)
+                self.task_replicas.pop(request.id, None)
+
+        merge_metadata(task, request)
         # For task status updates, we need to propagate metadata and provide
         # a unique message id.
         if (
-            hasattr(response.result, "status")
-            and hasattr(response.result.status, "message")
-            and response.result.status.message
+            hasattr(task, "status")
+            and hasattr(task.status, "message")
+            and task.status.message
         ):
-            merge_metadata(response.result.status.message, request.message)
-            m = response.result.status.message
+            merge_metadata(task.status.message, request.message)
+            m = task.status.message
             if not m.metadata:
                 m.metadata = {}
             if "message_id" in m.metadata:
@@ -76,8 +264,140 @@ class RemoteAgentConnections:
             m.metadata["message_id"] = str(uuid.uuid4())
 
         if task_callback:
-            task_callback(response.result, self.card)
-        return response.result
+            task_callback(task, self.card)
+        return task
+
+    def _forget_session_task(self, session_id: str, task_id: str):
+        tasks = self.session_tasks.get(session_id)
+        if tasks is not None:
+            tasks.discard(task_id)
+            if not tasks:
+                del self.session_tasks[session_id]
+
+    async def cancel_task(self, task_id: str) -> CancelTaskResponse:
+        """Asks the seller to stop working on the task."""
+        replica = self._pick_replica(task_id)
+        response = await replica.client.cancel_task(
+            TaskIdParams(id=task_id).model_dump()
+        )
+        if response.result is not None and response.result.status.state in (
+            TERMINAL_STATES
+        ):
+            self.task_replicas.pop(task_id, None)
+        return response
+
+    async def cancel_session_tasks(self, session_id: str):
+        """Cancels the unfinished tasks of a session, e.g. once it ended.
+
+        Failures are only logged, the seller eventually finishes the task on
+        its own.
+        """
+        self.session_replicas.pop(session_id, None)
+        for task_id in self.session_tasks.pop(session_id, set()):
+            try:
+                response = await self.cancel_task(task_id)
+            except A2AClientError as e:
+                logger.warning(f"Failed to cancel task {task_id}: {e}")
+                continue
+            if response.error is not None:
+                # The task finished meanwhile.
+                logger.info(f"Task {task_id} not cancelled: {response.error.message}")
+
+    async def wait_for_task(
+        self, task_id: str, push_event: asyncio.Event | None = None
+    ) -> Task:
+        """Waits for a task running in the background to stop working.
+
+        The task is polled at growing intervals, a push notification wakes the
+        wait up early. Returns the task as it is once A2A_TASK_TIMEOUT elapses.
+        """
+        deadline = time.monotonic() + A2A_TASK_TIMEOUT
+        interval = A2A_POLL_INITIAL_INTERVAL
+        while True:
+            if push_event is None:
+                await asyncio.sleep(interval)
+            else:
+                try:
+                    await asyncio.wait_for(push_event.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                push_event.clear()
+                task = PUSH_LISTENER.pop_update(task_id)
+                if task is not None and task.status.state not in ACTIVE_STATES:
+                    return task
+
+            response = await self.get_task(task_id)
+            if response.error is not None:
+                raise A2AClientError(
+                    f"Failed to get task {task_id}: {response.error.message}"
+                )
+            task = response.result
+            if task.status.state not in ACTIVE_STATES or time.monotonic() > deadline:
+                return task
+            interval = min(interval * 1.5, A2A_POLL_MAX_INTERVAL)
+
+    async def get_task(
+        self, task_id: str, history_length: int | None = None
+    ) -> GetTaskResponse:
+        """Gets a task, hedged with a second request if the first is slow.
+
+        The hedge goes to another replica, and is not sent if no other replica
+        is available since it would only add load to the slow one. A replica
+        that does not share the task store answers with an error, in which case
+        the answer of the other request is used.
+        """
+        params = TaskQueryParams(id=task_id, historyLength=history_length)
+        primary = self._pick_replica(task_id)
+        hedge_after = (
+            self.get_task_latency.percentile(self.hedge_percentile)
+            if self.hedge_percentile is not None and len(self.replicas) > 1
+            else None
+        )
+        pending = {asyncio.ensure_future(self._get_task(primary, params, hedge_after))}
+        fallback = None
+        try:
+            if hedge_after is not None:
+                done, _ = await asyncio.wait(pending, timeout=hedge_after)
+                hedge = self._pick_replica(exclude=primary)
+                if not done and hedge is not primary:
+                    pending.add(
+                        asyncio.ensure_future(
+                            self._get_task(hedge, params, hedge_after)
+                        )
+                    )
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for request in done:
+                    if request.exception() is None and request.result().error is None:
+                        return request.result()
+                    fallback = fallback or request
+            return fallback.result()
+        finally:
+            for request in pending:
+                request.cancel()
+
+    async def _get_task(
+        self,
+        replica: Replica,
+        params: TaskQueryParams,
+        hedge_after: float | None = None,
+    ) -> GetTaskResponse:
+        replica.outstanding += 1
+        start_time = time.perf_counter()
+        try:
+            response = await replica.client.get_task(params.model_dump())
+        except asyncio.CancelledError:
+            # Cancelled by a faster hedge, so slow. Its cut short latency would
+            # lower the percentile and make hedging ever more frequent.
+            latency = time.perf_counter() - start_time
+            self.get_task_latency.record(max(latency, hedge_after or 0))
+            raise
+        finally:
+            replica.outstanding -= 1
+        self.get_task_latency.record(time.perf_counter() - start_time)
+        return response
 
 
 def merge_metadata(target, source):
@@ -0,0 +1,192 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import re
+from typing import Any, List
+
+from google.adk.sessions.state import State
+from google.genai import types
+
+# Seller agents always report the order ID once an order has been created, so
+# any turn mentioning it is kept verbatim when older turns are compacted.
+ORDER_CONFIRMATION_PATTERN = re.compile(r"order[\s_-]*id", re.IGNORECASE)
+SUMMARY_HEADER = "Summary of the earlier conversation (older turns were compacted):"
+SUMMARY_SNIPPET_CHARS = 200
+MAX_SUMMARY_LINES = 20
+# Older order confirmations kept when a stored session is trimmed.
+MAX_PINNED_TURNS = 10
+
+
+def is_turn_start(content: types.Content | None) -> bool:
+    """A turn starts with a user text message, not with a tool response."""
+    if content is None or content.role != "user" or not content.parts:
+        return False
+    has_text = any(part.text for part in content.parts)
+    has_function_response = any(part.function_response for part in content.parts)
+    return has_text and not has_function_response
+
+
+def is_order_confirmation(content: types.Content | None) -> bool:
+    if content is None or not content.parts:
+        return False
+    for part in content.parts:
+        if part.text and ORDER_CONFIRMATION_PATTERN.search(part.text):
+            return True
+        if part.function_response and ORDER_CONFIRMATION_PATTERN.search(
+            str(part.function_response.response)
+        ):
+            return True
+    return False
+
+
+def summarize_content(content: types.Content, verbatim: bool = False) -> str | None:
+    """Renders a content as a single summary line.
+
+    Args:
+        content: The content to summarize.
+        verbatim: Keep the full text instead of truncating it.
+
+    Returns:
+        The summary line, or None if the content carries nothing worth keeping.
+    """
+    pieces = []
+    for part in content.parts or []:
+        if part.text:
+            pieces.append(part.text)
+        elif part.function_call:
+            pieces.append(
+                f"called {part.function_call.name}({part.function_call.args})"
+            )
+        elif part.function_response:
+            pieces.append(
+                f"{part.function_response.name} returned {part.function_response.response}"
+            )
+    if not pieces:
+        return None
+
+    text = " ".join(" ".join(pieces).split())
+    if not verbatim and len(text) > SUMMARY_SNIPPET_CHARS:
+        text = text[:SUMMARY_SNIPPET_CHARS] + "..."
+    return f"- {content.role}: {text}"
+
+
+def compact_contents(
+    contents: List[types.Content], max_turns: int
+) -> List[types.Content]:
+    """Keeps the last `max_turns` turns and folds older ones into a summary.
+
+    The summary keeps order confirmations verbatim and the most recent
+    `MAX_SUMMARY_LINES` other lines truncated, and is prepended to the first
+    kept user message so the request still starts with a complete turn.
+    """
+    turn_starts = [i for i, content in enumerate(contents) if is_turn_start(content)]
+    if max_turns <= 0 or len(turn_starts) <= max_turns:
+        return contents
+
+    cut = turn_starts[-max_turns]
+    older, recent = contents[:cut], contents[cut:]
+
+    lines = []
+    for content in older:
+        pinned = is_order_confirmation(content)
+        line = summarize_content(content, verbatim=pinned)
+        if line:
+            lines.append((pinned, line))
+    unpinned_budget = sum(1 for pinned, _ in lines if not pinned) - MAX_SUMMARY_LINES
+    summary_lines = []
+    for pinned, line in lines:
+        if not pinned and unpinned_budget > 0:
+            unpinned_budget -= 1
+            continue
+        summary_lines.append(line)
+
+    if not summary_lines:
+        return recent
+
+    summary = "\n".join([SUMMARY_HEADER, *summary_lines])
+    first = recent[0].model_copy(
+        update={"parts": [types.Part(text=summary), *recent[0].parts]}
+    )
+    return [first, *recent[1:]]
+
+
+def compact_llm_request(llm_request: Any, max_turns: int):
+    """Bounds the prompt sent to the model to the last `max_turns` turns."""
+    llm_request.contents = compact_contents(llm_request.contents, max_turns)
+
+
+def trim_session_events(
+    session_service: Any,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    max_events: int,
+    max_pinned_turns: int = MAX_PINNED_TURNS,
+):
+    """Drops the oldest whole turns of a stored session beyond `max_events`.
+
+    Up to `max_pinned_turns` of the older turns containing an order
+    confirmation are kept beyond the budget, so the model can still confirm
+    on behalf of the user later on. Only whole turns are dropped to never
+    leave a tool response without its matching tool call.
+    """
+    session = session_service.get_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+    if session is None or len(session.events) <= max_events:
+        return
+
+    turns = []
+    for event in session.events:
+        if not turns or is_turn_start(event.content):
+            turns.append([])
+        turns[-1].append(event)
+
+    kept = []
+    budget = max_events
+    pinned_budget = max_pinned_turns
+    for turn in reversed(turns):
+        if len(turn) <= budget:
+            budget -= len(turn)
+            kept.append(turn)
+            continue
+        budget = 0
+        if pinned_budget > 0 and any(
+            is_order_confirmation(event.content) for event in turn
+        ):
+            pinned_budget -= 1
+            kept.append(turn)
+
+    # Session services have no call to drop events, so the session is
+    # recreated with the kept ones. Its state is already up to date, the
+    # state deltas of the events must not be applied again.
+    state = {
+        key: value
+        for key, value in session.state.items()
+        if not key.startswith((State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX))
+    }
+    session_service.delete_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+    trimmed = session_service.create_session(
+        app_name=app_name, user_id=user_id, state=state, session_id=session_id
+    )
+    for turn in reversed(kept):
+        for event in turn:
+            actions = event.actions.model_copy(update={"state_delta": {}})
+            session_service.append_event(
+                trimmed, event.model_copy(update={"actions": actions})
+            )
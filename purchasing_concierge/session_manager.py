@@ -0,0 +1,150 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+
+class ConciergeSession:
+    """The ADK session bound to a single front end (browser) session."""
+
+    def __init__(self, user_id: str, session_id: str):
+        self.user_id = user_id
+        self.session_id = session_id
+        self.last_used = time.monotonic()
+        # Serialises the turns of one user, different users run concurrently.
+        self.lock = asyncio.Lock()
+        # Turns running or waiting for the lock.
+        self.active_turns = 0
+        # Released while busy, the release happens once the last turn ends.
+        self.closing = False
+
+    @property
+    def busy(self) -> bool:
+        return self.active_turns > 0
+
+
+class ConciergeSessionManager:
+    """A bounded store of ADK sessions keyed by front end session id.
+
+    Sessions idle for longer than `idle_timeout` seconds are evicted, and once
+    `max_sessions` is reached the least recently used idle session is evicted
+    to make room for a new one. `on_release` is called with the ADK session of
+    every released session before it is deleted. A session is never deleted
+    while one of its turns is running, `on_release` is then called right away,
+    so that the work of the turn can be cancelled, and again once it ends.
+    """
+
+    def __init__(
+        self,
+        session_service: Any,
+        app_name: str,
+        max_sessions: int = 100,
+        idle_timeout: float = 30 * 60,
+        on_release: Callable[[Any], None] | None = None,
+    ):
+        self.session_service = session_service
+        self.app_name = app_name
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.on_release = on_release
+        self.sessions: OrderedDict[str, ConciergeSession] = OrderedDict()
+
+    def acquire(self, client_id: str) -> ConciergeSession:
+        """Returns the session of `client_id`, creating it if needed."""
+        self.evict_idle()
+        session = self.sessions.get(client_id)
+        if session is None:
+            self._evict_least_recently_used()
+            session = ConciergeSession(user_id=client_id, session_id=str(uuid.uuid4()))
+            self.session_service.create_session(
+                app_name=self.app_name,
+                user_id=session.user_id,
+                session_id=session.session_id,
+            )
+            self.sessions[client_id] = session
+        self.sessions.move_to_end(client_id)
+        session.last_used = time.monotonic()
+        session.closing = False
+        return session
+
+    @asynccontextmanager
+    async def turn(self, client_id: str) -> AsyncIterator[ConciergeSession]:
+        """Runs a turn in the session of `client_id`, holding its lock."""
+        session = self.acquire(client_id)
+        session.active_turns += 1
+        try:
+            async with session.lock:
+                yield session
+        finally:
+            session.active_turns -= 1
+            if session.closing and not session.busy:
+                self.release(client_id)
+
+    def release(self, client_id: str):
+        """Drops the session of `client_id`, e.g. when the browser tab is closed.
+
+        A busy session is only marked as closing, and deleted when its last
+        turn ends, so the ADK session is never deleted under a running turn.
+        """
+        session = self.sessions.get(client_id)
+        if session is None:
+            return
+        self._notify_release(session)
+        if session.busy:
+            session.closing = True
+            return
+        del self.sessions[client_id]
+        self.session_service.delete_session(
+            app_name=self.app_name,
+            user_id=session.user_id,
+            session_id=session.session_id,
+        )
+        # InMemorySessionService leaves an empty dict behind for the user.
+        user_sessions = getattr(self.session_service, "sessions", {}).get(
+            self.app_name, {}
+        )
+        if not user_sessions.get(session.user_id):
+            user_sessions.pop(session.user_id, None)
+
+    def _notify_release(self, session: ConciergeSession):
+        if self.on_release is None:
+            return
+        adk_session = self.session_service.get_session(
+            app_name=self.app_name,
+            user_id=session.user_id,
+            session_id=session.session_id,
+        )
+        if adk_session is not None:
+            self.on_release(adk_session)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        for client_id, session in list(self.sessions.items()):
+            if now - session.last_used > self.idle_timeout and not session.busy:
+                self.release(client_id)
+
+    def _evict_least_recently_used(self):
+        for client_id, session in list(self.sessions.items()):
+            if len(self.sessions) < self.max_sessions:
+                return
+            # Never evict a session in the middle of a turn.
+            if not session.busy:
+                self.release(client_id)
@@ -0,0 +1,103 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import List, NamedTuple
+
+IMPORTTIME_PREFIX = "import time:"
+
+
+class ImportTiming(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    module: str
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parses the stderr output of `python -X importtime`."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        fields = line[len(IMPORTTIME_PREFIX) :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Skips the header line.
+            continue
+        # Nested imports are indented by two spaces per level.
+        name = fields[2][1:]
+        module = name.lstrip()
+        timings.append(
+            ImportTiming(
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                module=module,
+                depth=(len(name) - len(module)) // 2,
+            )
+        )
+    return timings
+
+
+def measure(module: str, build_agent: bool) -> List[ImportTiming]:
+    """Imports `module` in a fresh interpreter and returns the import timings."""
+    code = f"import {module}"
+    if build_agent:
+        code += "; from purchasing_concierge import get_root_agent; get_root_agent()"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}: {result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main(argv: List[str] | None = None):
+    """Prints the slowest imports of a module.
+
+    Usage:
+        python -m purchasing_concierge.startup_report [module] [--top 20] [--build-agent]
+    """
+    parser = argparse.ArgumentParser(
+        description="Reports the startup time of a module with `python -X importtime`."
+    )
+    parser.add_argument("module", nargs="?", default="purchasing_concierge")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--build-agent",
+        action="store_true",
+        help="Also build the root agent, which imports google.adk and fetches the seller agent cards.",
+    )
+    args = parser.parse_args(argv)
+
+    timings = measure(args.module, args.build_agent)
+    # Top level imports are not nested, so their cumulative times add up.
+    total_us = sum(t.cumulative_us for t in timings if t.depth == 0)
+    print(f"Imported {len(timings)} modules in {total_us / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[
+        : args.top
+    ]:
+        print(
+            f"{timing.cumulative_us / 1000:>14.1f} {timing.self_us / 1000:>9.1f}  {timing.module}"
+        )
+
+
+if __name__ == "__main__":
+    main()
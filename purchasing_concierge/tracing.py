@@ -0,0 +1,95 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from typing import Any
+import logging
+import os
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+logger = logging.getLogger(__name__)
+
+
+def setup_tracing(service_name: str = "purchasing_concierge") -> bool:
+    """Exports spans if an exporter is configured in the environment.
+
+    ADK already traces each invocation, LLM call and tool call, and the A2A
+    client propagates the trace to the seller agents. Spans are sent to the
+    OTLP/HTTP collector at OTEL_EXPORTER_OTLP_ENDPOINT, or appended as JSON
+    lines to the file at TRACES_FILE. Without either, tracing stays a no-op.
+
+    Returns:
+        Whether spans are exported.
+    """
+    otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    traces_file = os.getenv("TRACES_FILE")
+    if not otlp_endpoint and not traces_file:
+        return False
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(
+            resource=Resource.create(
+                {"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}
+            )
+        )
+        trace.set_tracer_provider(provider)
+
+    if otlp_endpoint:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+
+            # Reads the endpoint and headers from the OTEL_EXPORTER_OTLP_* variables.
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        except ImportError:
+            logger.warning(
+                "OTEL_EXPORTER_OTLP_ENDPOINT is set but "
+                "opentelemetry-exporter-otlp-proto-http is not installed"
+            )
+    if traces_file:
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                _json_lines_file_exporter(ConsoleSpanExporter, traces_file)
+            )
+        )
+    return True
+
+
+def _json_lines_file_exporter(exporter_class: Any, path: str) -> Any:
+    """A console exporter appending spans as JSON lines to the file at `path`.
+
+    The file is closed when the exporter is shut down, which the tracer
+    provider does on exit after flushing the pending spans.
+    """
+
+    class JsonLinesFileExporter(exporter_class):
+        def __init__(self):
+            self.file = open(path, "a")
+            super().__init__(
+                out=self.file,
+                formatter=lambda span: span.to_json(indent=None) + "\n",
+            )
+
+        def shutdown(self):
+            super().shutdown()
+            self.file.close()
+
+    return JsonLinesFileExporter()
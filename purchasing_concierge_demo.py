@@ -16,74 +16,167 @@ limitations under the License.
 
 import gradio as gr
 from typing import List, Dict, Any
-from purchasing_concierge.agent import root_agent as purchasing_agent
-from google.adk.sessions import InMemorySessionService
+from purchasing_concierge.agent import get_purchasing_agent, get_root_agent
+from purchasing_concierge.logging_config import setup_logging
+from purchasing_concierge.push_listener import PUSH_LISTENER
+from purchasing_concierge.session_compaction import trim_session_events
+from purchasing_concierge.session_manager import (
+    ConciergeSession,
+    ConciergeSessionManager,
+)
+from google.adk.sessions import InMemorySessionService, Session
 from google.adk.runners import Runner
 from google.adk.events import Event
 from typing import AsyncIterator
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.genai import types
-from pprint import pformat
+from functools import cache
+import asyncio
+import json
 
 APP_NAME = "purchasing_concierge_app"
-USER_ID = "default_user"
-SESSION_ID = "default_session"
+# Upper bound of events kept in memory per session, the oldest turns are
+# dropped first while order confirmations are always kept.
+MAX_SESSION_EVENTS = 200
+# Each browser session gets its own ADK session, idle ones are evicted.
+MAX_SESSIONS = 100
+SESSION_IDLE_TIMEOUT = 30 * 60
+CONCURRENCY_LIMIT = 16
+# Tool payloads longer than this are truncated in the chat
+MAX_TOOL_PAYLOAD_CHARS = 2000
 SESSION_SERVICE = InMemorySessionService()
-PURCHASING_AGENT_RUNNER = Runner(
-    agent=purchasing_agent,  # The agent we want to run
-    app_name=APP_NAME,  # Associates runs with our app
-    session_service=SESSION_SERVICE,  # Uses our session manager
-)
-SESSION_SERVICE.create_session(
-    app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
+# Keeps the running cancellations referenced until they finish.
+_CANCELLATIONS: set[asyncio.Task] = set()
+
+
+def cancel_seller_tasks(adk_session: Session):
+    """Cancel the seller tasks still running for a released session."""
+    session_id = adk_session.state.get("session_id")
+    if session_id is None:
+        # No task was ever sent to a seller.
+        return
+    cancellation = asyncio.create_task(
+        get_purchasing_agent().cancel_session_tasks(session_id)
+    )
+    _CANCELLATIONS.add(cancellation)
+    cancellation.add_done_callback(_CANCELLATIONS.discard)
+
+
+SESSION_MANAGER = ConciergeSessionManager(
+    session_service=SESSION_SERVICE,
+    app_name=APP_NAME,
+    max_sessions=MAX_SESSIONS,
+    idle_timeout=SESSION_IDLE_TIMEOUT,
+    on_release=cancel_seller_tasks,
 )
 
 
+@cache
+def get_runner() -> Runner:
+    """Builds the runner, and the purchasing agent with it, on first use."""
+    return Runner(
+        agent=get_root_agent(),  # The agent we want to run
+        app_name=APP_NAME,  # Associates runs with our app
+        session_service=SESSION_SERVICE,  # Uses our session manager
+    )
+
+
 async def get_response_from_agent(
     message: str,
     history: List[Dict[str, Any]],
+    request: gr.Request,
 ) -> str:
     """Send the message to the backend and get a response.
 
     Args:
         message: Text content of the message.
         history: List of previous message dictionaries in the conversation.
+        request: The Gradio request, used to pick the browser session.
 
     Returns:
         Text response from the backend service.
     """
+    async with SESSION_MANAGER.turn(request.session_hash) as session:
+        async for responses in _run_agent(message, session):
+            yield responses
+
+        trim_session_events(
+            SESSION_SERVICE,
+            APP_NAME,
+            session.user_id,
+            session.session_id,
+            MAX_SESSION_EVENTS,
+        )
+
+
+def format_tool_payload(payload: Any) -> str:
+    """Render a tool call or response payload as a JSON code block."""
+    formatted = json.dumps(payload, indent=2, ensure_ascii=False, default=str)
+    if len(formatted) > MAX_TOOL_PAYLOAD_CHARS:
+        formatted = formatted[:MAX_TOOL_PAYLOAD_CHARS] + "\n..."
+    return f"```json\n{formatted}\n```"
+
+
+async def end_session(request: gr.Request):
+    """Release the ADK session when the browser tab is closed.
+
+    A turn still running keeps the session until it ends, the seller tasks
+    it waits for are cancelled right away.
+    """
+    # Async so that the seller tasks are cancelled on the event loop.
+    SESSION_MANAGER.release(request.session_hash)
+
+
+async def _run_agent(message: str, session: ConciergeSession):
     # try:
-    events_iterator: AsyncIterator[Event] = PURCHASING_AGENT_RUNNER.run_async(
-        user_id=USER_ID,
-        session_id=SESSION_ID,
+    events_iterator: AsyncIterator[Event] = get_runner().run_async(
+        user_id=session.user_id,
+        session_id=session.session_id,
         new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+        # Stream partial text events so the first tokens show up immediately
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE),
     )
 
     responses = []
+    # The message receiving partial text until the merged event arrives
+    streaming_message = None
     async for event in events_iterator:  # event has type Event
-        if event.content.parts:
+        if event.partial and event.content and event.content.parts:
+            text = "".join(part.text for part in event.content.parts if part.text)
+            if not text:
+                continue
+            if streaming_message is None:
+                streaming_message = gr.ChatMessage(role="assistant", content="")
+                responses.append(streaming_message)
+            streaming_message.content += text
+            yield responses
+            continue
+
+        if event.content and event.content.parts:
             for part in event.content.parts:
                 if part.function_call:
-                    formatted_call = f"```python\n{pformat(part.function_call.model_dump(), indent=2, width=80)}\n```"
                     responses.append(
                         gr.ChatMessage(
                             role="assistant",
-                            content=f"{part.function_call.name}:\n{formatted_call}",
+                            content=f"{part.function_call.name}:\n"
+                            f"{format_tool_payload(part.function_call.args)}",
                             metadata={"title": "🛠️ Tool Call"},
                         )
                     )
                 elif part.function_response:
-                    formatted_response = f"```python\n{pformat(part.function_response.model_dump(), indent=2, width=80)}\n```"
-
                     responses.append(
                         gr.ChatMessage(
                             role="assistant",
-                            content=formatted_response,
+                            content=format_tool_payload(
+                                part.function_response.response
+                            ),
                             metadata={"title": "⚡ Tool Response"},
                         )
                     )
 
         # Key Concept: is_final_response() marks the concluding message for the turn
         if event.is_final_response():
+            final_response_text = None
             if event.content and event.content.parts:
                 # Extract text from the first part
                 final_response_text = event.content.parts[0].text
@@ -92,11 +185,16 @@ async def get_response_from_agent(
                 final_response_text = (
                     f"Agent escalated: {event.error_message or 'No specific message.'}"
                 )
-            responses.append(
-                gr.ChatMessage(role="assistant", content=final_response_text)
-            )
-            yield responses
-            break  # Stop processing events once the final response is found
+            if streaming_message is not None:
+                # The merged event replaces the streamed chunks
+                streaming_message.content = final_response_text or ""
+            elif final_response_text:
+                responses.append(
+                    gr.ChatMessage(role="assistant", content=final_response_text)
+                )
+        # With streaming, a merged text event may be followed by tool calls of
+        # the same turn, so keep consuming events until the run ends.
+        streaming_message = None
 
         yield responses
     # except Exception as e:
@@ -109,14 +207,32 @@ async def get_response_from_agent(
 
 
 if __name__ == "__main__":
+    setup_logging()
+    # Discover the remote sellers before serving rather than on the first chat
+    get_runner()
+
     demo = gr.ChatInterface(
         get_response_from_agent,
         title="Purchasing Concierge",
         description="This assistant can help you to purchase food from remote sellers.",
         type="messages",
+        concurrency_limit=CONCURRENCY_LIMIT,
     )
-
-    demo.launch(
-        server_name="0.0.0.0",
-        server_port=8080,
-    )
+    demo.unload(end_session)
+
+    if PUSH_LISTENER.url:
+        # Serves the push notifications of the sellers next to the UI.
+        import uvicorn
+        from fastapi import FastAPI
+
+        app = FastAPI()
+        app.add_api_route(
+            PUSH_LISTENER.path, PUSH_LISTENER.handle_request, methods=["GET", "POST"]
+        )
+        app = gr.mount_gradio_app(app, demo, path="/")
+        uvicorn.run(app, host="0.0.0.0", port=8080)
+    else:
+        demo.launch(
+            server_name="0.0.0.0",
+            server_port=8080,
+        )
@@ -0,0 +1,138 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+
+DEFAULT_MAX_PAYLOAD_CHARS = 1000
+# Attributes every LogRecord has, anything else was passed with `extra`.
+RESERVED_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+
+
+def truncate(value: Any, max_chars: int) -> str:
+    """Renders a payload as compact JSON, truncated to `max_chars`."""
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if max_chars > 0 and len(text) > max_chars:
+        return f"{text[:max_chars]}... ({len(text) - max_chars} more chars)"
+    return text
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats records as JSON lines, or as text, with their `extra` fields.
+
+    Extra fields such as request payloads are truncated to `max_payload_chars`.
+    """
+
+    def __init__(
+        self,
+        json_output: bool = True,
+        max_payload_chars: int = DEFAULT_MAX_PAYLOAD_CHARS,
+    ):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        self.json_output = json_output
+        self.max_payload_chars = max_payload_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {
+            key: truncate(value, self.max_payload_chars)
+            for key, value in vars(record).items()
+            if key not in RESERVED_ATTRIBUTES and value is not None
+        }
+        if not self.json_output:
+            line = super().format(record)
+            extra = " ".join(f"{key}={value}" for key, value in fields.items())
+            return f"{line} {extra}" if extra else line
+
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **fields,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` fraction of records below WARNING, and all others."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record is formatted by the
+        # listener thread instead of the thread that logged it.
+        return record
+
+
+def setup_logging(
+    level: str | None = None,
+    json_output: bool | None = None,
+    sample_rate: float | None = None,
+    max_payload_chars: int | None = None,
+):
+    """Routes all logs through a queue to a background thread writing stderr.
+
+    Logging calls only enqueue the record, formatting and writing happen on the
+    listener thread. Arguments default to the LOG_LEVEL, LOG_FORMAT ("json" or
+    "text"), LOG_SAMPLE_RATE and LOG_MAX_PAYLOAD_CHARS environment variables.
+    Calling it again in the same process is a no-op.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    if level is None:
+        level = os.getenv("LOG_LEVEL", "INFO")
+    if json_output is None:
+        json_output = os.getenv("LOG_FORMAT", "json").lower() == "json"
+    if sample_rate is None:
+        sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+    if max_payload_chars is None:
+        max_payload_chars = int(
+            os.getenv("LOG_MAX_PAYLOAD_CHARS", DEFAULT_MAX_PAYLOAD_CHARS)
+        )
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(StructuredFormatter(json_output, max_payload_chars))
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # Flushes the queued records on exit.
+    atexit.register(_listener.stop)
@@ -0,0 +1,114 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import deque
+from typing import Any, Tuple
+from a2a_types import InternalError, JSONRPCError, TaskStatusUpdateEvent
+import a2a_server.metrics as metrics
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+QueueItem = Tuple[int | None, Any]
+
+
+def _is_droppable(item: QueueItem) -> bool:
+    # The final event and errors end the stream, they are always delivered.
+    _, event = item
+    if isinstance(event, JSONRPCError):
+        return False
+    return not (isinstance(event, TaskStatusUpdateEvent) and event.final)
+
+
+def _is_status_update(item: QueueItem) -> bool:
+    return isinstance(item[1], TaskStatusUpdateEvent) and _is_droppable(item)
+
+
+class SubscriberQueue:
+    """The bounded queue of events waiting to be sent to one SSE subscriber.
+
+    Putting never waits for the subscriber. Once `maxsize` events are queued,
+    the overflow policy applies:
+
+    - drop_oldest: the oldest event is dropped.
+    - coalesce: queued status updates are dropped, since the new one supersedes
+      them, and the oldest event is dropped if there were none.
+    - disconnect: the queue is replaced by an error ending the stream, the
+      client can resubscribe from its last event id.
+
+    Final status updates and errors are never dropped.
+    """
+
+    def __init__(self, maxsize: int, overflow_policy: str = DROP_OLDEST):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown SSE overflow policy: {overflow_policy}")
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.items: deque[QueueItem] = deque()
+        self.disconnected = False
+        self._not_empty = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self.items)
+
+    def put_nowait(self, item: QueueItem):
+        if self.disconnected:
+            return
+        if self.maxsize > 0 and len(self.items) >= self.maxsize:
+            self._overflow(item)
+        if not self.disconnected:
+            self.items.append(item)
+        self._not_empty.set()
+
+    async def get(self) -> QueueItem:
+        while not self.items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.items.popleft()
+
+    def _overflow(self, item: QueueItem):
+        if self.overflow_policy == DISCONNECT:
+            logger.warning("Disconnecting a slow SSE subscriber")
+            metrics.SSE_SLOW_SUBSCRIBERS_DISCONNECTED.inc()
+            self.disconnected = True
+            self.items.clear()
+            self.items.append(
+                (None, InternalError(message="Too slow to receive the task events"))
+            )
+            return
+
+        if self.overflow_policy == COALESCE and _is_status_update(item):
+            superseded = [queued for queued in self.items if _is_status_update(queued)]
+            if superseded:
+                self.items = deque(
+                    queued for queued in self.items if not _is_status_update(queued)
+                )
+                metrics.SSE_EVENTS_DROPPED.labels(reason="coalesced").inc(
+                    len(superseded)
+                )
+                return
+
+        for queued in self.items:
+            if _is_droppable(queued):
+                self.items.remove(queued)
+                metrics.SSE_EVENTS_DROPPED.labels(reason="overflow").inc()
+                return
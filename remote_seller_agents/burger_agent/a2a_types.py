@@ -375,6 +375,14 @@ class A2AClientJSONError(A2AClientError):
         super().__init__(f"JSON Error: {message}")
 
 
+class A2AClientUnavailableError(A2AClientError):
+    """The remote agent is unreachable, or its circuit breaker is open."""
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(f"Agent unavailable: {message}")
+
+
 class MissingAPIKeyError(Exception):
     """Exception for missing API key."""
 
@@ -17,16 +17,13 @@ limitations under the License.
 from typing import Literal
 from pydantic import BaseModel
 import uuid
-from crewai import Agent, Crew, LLM, Task, Process
-from crewai.tools import tool
 from dotenv import load_dotenv
-import litellm
+import a2a_server.tracing as tracing
+import logging
 import os
 
 load_dotenv()
-
-litellm.vertex_project = os.getenv("GCLOUD_PROJECT_ID")
-litellm.vertex_location = os.getenv("GCLOUD_LOCATION")
+logger = logging.getLogger(__name__)
 
 
 class ResponseFormat(BaseModel):
@@ -48,7 +45,6 @@ class Order(BaseModel):
     order_items: list[OrderItem]
 
 
-@tool("create_order")
 def create_burger_order(order_items: list[OrderItem]) -> str:
     """
     Creates a new burger order with the given order items.
@@ -59,15 +55,14 @@ def create_burger_order(order_items: list[OrderItem]) -> str:
     Returns:
         str: A message indicating that the order has been created.
     """
-    try:
-        order_id = str(uuid.uuid4())
-        order = Order(order_id=order_id, status="created", order_items=order_items)
-        print("===")
-        print(f"order created: {order}")
-        print("===")
-    except Exception as e:
-        print(f"Error creating order: {e}")
-        return f"Error creating order: {e}"
+    with tracing.start_span("tool_call [create_burger_order]"):
+        try:
+            order_id = str(uuid.uuid4())
+            order = Order(order_id=order_id, status="created", order_items=order_items)
+            logger.info("Order created", extra={"order": order.model_dump()})
+        except Exception as e:
+            logger.error(f"Error creating order: {e}")
+            return f"Error creating order: {e}"
     return f"Order {order.model_dump()} has been created"
 
 
@@ -105,10 +100,35 @@ Provided below is the available burger menu and it's related price:
 """
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-    def invoke(self, query, sessionId) -> str:
-        model = LLM(
+    def __init__(self):
+        self.model = None
+        self.tools = None
+
+    def warm_up(self):
+        """Imports CrewAI and builds the model and tools once.
+
+        CrewAI and LiteLLM take seconds to import, so they are only loaded here
+        instead of at module import time. Call it before serving requests.
+        """
+        if self.model is not None:
+            return
+
+        from crewai import LLM
+        from crewai.tools import tool
+        import litellm
+
+        litellm.vertex_project = os.getenv("GCLOUD_PROJECT_ID")
+        litellm.vertex_location = os.getenv("GCLOUD_LOCATION")
+
+        self.tools = [tool("create_order")(create_burger_order)]
+        self.model = LLM(
             model="vertex_ai/gemini-2.0-flash",  # Use base model name without provider prefix
         )
+
+    def invoke(self, query, sessionId) -> str:
+        from crewai import Agent, Crew, Task, Process
+
+        self.warm_up()
         burger_agent = Agent(
             role="Burger Seller Agent",
             goal=(
@@ -117,8 +137,8 @@ Provided below is the available burger menu and it's related price:
             backstory=("You are an expert and helpful burger seller agent."),
             verbose=False,
             allow_delegation=False,
-            tools=[create_burger_order],
-            llm=model,
+            tools=self.tools,
+            llm=self.model,
         )
 
         agent_task = Task(
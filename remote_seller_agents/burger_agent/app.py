@@ -0,0 +1,110 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from a2a_server.server import A2AServer
+import a2a_server.tracing as tracing
+from a2a_server.logging_config import setup_logging
+from a2a_types import AgentCard, AgentCapabilities, AgentSkill, AgentAuthentication
+from a2a_server.push_notification_auth import PushNotificationSenderAuth
+from task_manager import AgentTaskManager
+from agent import BurgerSellerAgent
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+DEFAULT_PORT = 10001
+
+
+def build_server(
+    host: str,
+    port: int,
+    jwk_path: str | None = None,
+    task_store_path: str | None = None,
+    warm_up: bool = True,
+) -> A2AServer:
+    """Builds the Burger Seller Agent server."""
+    tracing.setup_tracing("burger_seller_agent")
+    capabilities = AgentCapabilities(pushNotifications=True)
+    skill = AgentSkill(
+        id="create_burger_order",
+        name="Burger Order Creation Tool",
+        description="Helps with creating burger orders",
+        tags=["burger order creation"],
+        examples=["I want to order 2 classic cheeseburgers"],
+    )
+    agent_card = AgentCard(
+        name="burger_seller_agent",
+        description="Helps with creating burger orders",
+        # The URL provided here is for the sake of demo,
+        # in production you should use a proper domain name
+        url=f"http://{host}:{port}/",
+        version="1.0.0",
+        authentication=AgentAuthentication(schemes=["Basic"]),
+        defaultInputModes=BurgerSellerAgent.SUPPORTED_CONTENT_TYPES,
+        defaultOutputModes=BurgerSellerAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+    agent = BurgerSellerAgent()
+    if warm_up:
+        # Warm up before serving so the first request does not pay for importing
+        # the LLM framework and building the model.
+        agent.warm_up()
+
+    notification_sender_auth = PushNotificationSenderAuth()
+    if jwk_path:
+        notification_sender_auth.load_jwk(jwk_path)
+    else:
+        notification_sender_auth.generate_jwk()
+    server = A2AServer(
+        agent_card=agent_card,
+        task_manager=AgentTaskManager(
+            agent=agent,
+            notification_sender_auth=notification_sender_auth,
+            store_path=task_store_path,
+        ),
+        host=host,
+        port=port,
+        auth_username=os.environ.get("AUTH_USERNAME"),
+        auth_password=os.environ.get("AUTH_PASSWORD"),
+    )
+
+    server.app.add_route(
+        "/.well-known/jwks.json",
+        notification_sender_auth.handle_jwks_endpoint,
+        methods=["GET"],
+    )
+    return server
+
+
+def create_app():
+    """App factory used by each worker process, configured from the environment.
+
+    Workers must share JWK_PATH and TASK_STORE_PATH so that they sign push
+    notifications with the same key and see the same tasks, and report their
+    metrics together through PROMETHEUS_MULTIPROC_DIR, e.g.:
+
+        gunicorn --preload -w 4 -k uvicorn.workers.UvicornWorker 'app:create_app()'
+    """
+    setup_logging()
+    return build_server(
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", DEFAULT_PORT)),
+        jwk_path=os.getenv("JWK_PATH"),
+        task_store_path=os.getenv("TASK_STORE_PATH"),
+    ).app
@@ -0,0 +1,111 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from a2a_types import (
+    Artifact,
+    Message,
+    TaskArtifactUpdateEvent,
+    TaskQueryParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from task_manager import AgentTaskManager
+
+
+def subscribers() -> float:
+    return REGISTRY.get_sample_value("a2a_sse_subscribers")
+
+
+async def start_task(manager: AgentTaskManager, task_id: str = "task"):
+    await manager.upsert_task(
+        TaskSendParams(
+            id=task_id, message=Message(role="user", parts=[TextPart(text="hi")])
+        )
+    )
+    await manager.update_store(task_id, TaskStatus(state=TaskState.WORKING), None)
+    await manager.update_store(
+        task_id,
+        TaskStatus(state=TaskState.WORKING),
+        [Artifact(parts=[TextPart(text="order")])],
+    )
+
+
+async def resubscribe(manager: AgentTaskManager, last_event_id: int | None):
+    return await manager.on_resubscribe_to_task(
+        TaskResubscriptionRequest(params=TaskQueryParams(id="task")),
+        last_event_id=last_event_id,
+    )
+
+
+async def collect(stream) -> list:
+    return [(event_id, response.result) async for event_id, response in stream]
+
+
+def test_replays_the_events_after_the_last_event_id():
+    async def scenario():
+        manager = AgentTaskManager(None, None)
+        await start_task(manager)
+        await manager.update_store("task", TaskStatus(state=TaskState.COMPLETED), None)
+        return await collect(await resubscribe(manager, last_event_id=2))
+
+    events = asyncio.run(scenario())
+
+    assert [event_id for event_id, _ in events] == [3, 4]
+    assert events[0][1].status.state == TaskState.WORKING
+    assert events[1][1].final
+
+
+def test_sends_a_snapshot_when_missed_events_were_dropped():
+    async def scenario():
+        manager = AgentTaskManager(None, None)
+        manager.event_log_size = 2
+        await start_task(manager)
+        await manager.update_store("task", TaskStatus(state=TaskState.COMPLETED), None)
+        return await collect(await resubscribe(manager, last_event_id=1))
+
+    events = asyncio.run(scenario())
+
+    assert [event_id for event_id, _ in events] == [None, None]
+    assert isinstance(events[0][1], TaskArtifactUpdateEvent)
+    assert isinstance(events[1][1], TaskStatusUpdateEvent) and events[1][1].final
+
+
+def test_streams_live_events_after_the_replay():
+    async def scenario():
+        manager = AgentTaskManager(None, None)
+        await start_task(manager)
+        stream = await resubscribe(manager, last_event_id=3)
+        received = asyncio.create_task(collect(stream))
+        while not manager.task_sse_subscribers:
+            await asyncio.sleep(0)
+        during = subscribers()
+        await manager.update_store("task", TaskStatus(state=TaskState.COMPLETED), None)
+        return await received, during, manager
+
+    before = subscribers()
+    events, during, manager = asyncio.run(scenario())
+
+    assert [event_id for event_id, _ in events] == [4]
+    assert during == before + 1
+    assert subscribers() == before
+    assert manager.task_sse_subscribers == {}
+
+
+def test_a_stream_never_iterated_does_not_subscribe():
+    async def scenario():
+        manager = AgentTaskManager(None, None)
+        await start_task(manager)
+        stream = await resubscribe(manager, last_event_id=None)
+        await stream.aclose()
+        return manager
+
+    before = subscribers()
+    manager = asyncio.run(scenario())
+
+    assert manager.task_sse_subscribers == {}
+    assert subscribers() == before
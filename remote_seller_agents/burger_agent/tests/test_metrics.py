@@ -0,0 +1,90 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from prometheus_client import REGISTRY
+
+from a2a_server.server import A2AServer
+import a2a_server.metrics as metrics
+from a2a_types import (
+    AgentAuthentication,
+    AgentCapabilities,
+    AgentCard,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+)
+
+
+def test_renders_the_metrics_of_this_process():
+    metrics.REQUESTS.labels(method="test/render", outcome="ok").inc(3)
+
+    lines = metrics.render().decode().splitlines()
+
+    assert 'a2a_requests_total{method="test/render",outcome="ok"} 3.0' in lines
+    assert "# TYPE a2a_request_duration_seconds histogram" in lines
+
+
+def test_workers_report_their_metrics_together(tmp_path):
+    agent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+    def run_worker(code: str) -> str:
+        return subprocess.run(
+            [sys.executable, "-c", "import a2a_server.metrics as metrics\n" + code],
+            cwd=agent_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    for _ in range(2):
+        run_worker(
+            'metrics.REQUESTS.labels(method="tasks/get", outcome="ok").inc()\n'
+            "metrics.SSE_SUBSCRIBERS.inc()\n"
+            "metrics.mark_process_dead()"
+        )
+    run_worker("metrics.SSE_SUBSCRIBERS.inc()")
+    lines = run_worker("print(metrics.render().decode())").splitlines()
+
+    assert 'a2a_requests_total{method="tasks/get",outcome="ok"} 2.0' in lines
+    # Only the subscriber of the worker still alive, the others exited.
+    assert "a2a_sse_subscribers 1.0" in lines
+
+
+def test_streamed_requests_are_measured_when_the_stream_ends():
+    method = "test/stream"
+
+    def observed_count():
+        return (
+            REGISTRY.get_sample_value(
+                "a2a_request_duration_seconds_count", {"method": method}
+            )
+            or 0
+        )
+
+    async def events():
+        await asyncio.sleep(0)
+        yield 1, TaskStatusUpdateEvent(
+            id="task", status=TaskStatus(state=TaskState.COMPLETED), final=True
+        )
+
+    async def scenario():
+        agent_card = AgentCard(
+            name="test_agent",
+            url="http://localhost/",
+            version="1.0.0",
+            authentication=AgentAuthentication(schemes=["Bearer"]),
+            capabilities=AgentCapabilities(),
+            skills=[],
+        )
+        server = A2AServer(agent_card=agent_card, api_key="key")
+        response = server._create_response(events(), method)
+        assert observed_count() == 0
+        sent = [event async for event in response.body_iterator]
+        assert sent[0]["id"] == "1"
+        assert observed_count() == 1
+
+    asyncio.run(scenario())
@@ -14,75 +14,88 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from a2a_server.server import A2AServer
-from a2a_types import AgentCard, AgentCapabilities, AgentSkill, AgentAuthentication
-from a2a_server.push_notification_auth import PushNotificationSenderAuth
-from task_manager import AgentTaskManager
-from agent import PizzaSellerAgent
+from app import build_server, DEFAULT_PORT
+from a2a_server.logging_config import setup_logging
+from a2a_server.server import run_workers
 import click
+import glob
 import logging
-from dotenv import load_dotenv
 import os
+import shutil
+import tempfile
 
-load_dotenv()
-
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
 @click.command()
 @click.option("--host", "host", default="0.0.0.0")
-@click.option("--port", "port", default=10000)
-def main(host, port):
+@click.option("--port", "port", default=DEFAULT_PORT)
+@click.option(
+    "--jwk-path",
+    "jwk_path",
+    envvar="JWK_PATH",
+    default=None,
+    help="File persisting the push-notification signing key, generated per boot if unset.",
+)
+@click.option(
+    "--task-store-path",
+    "task_store_path",
+    envvar="TASK_STORE_PATH",
+    default=None,
+    help="SQLite file storing the tasks, kept in memory if unset.",
+)
+@click.option("--workers", "workers", envvar="WEB_CONCURRENCY", default=1)
+@click.option(
+    "--loop", "loop", type=click.Choice(["auto", "asyncio", "uvloop"]), default="auto"
+)
+@click.option(
+    "--http", "http", type=click.Choice(["auto", "h11", "httptools"]), default="auto"
+)
+def main(host, port, jwk_path, task_store_path, workers, loop, http):
     """Starts the Pizza Seller Agent server."""
     try:
-        capabilities = AgentCapabilities(pushNotifications=True)
-        skill = AgentSkill(
-            id="create_pizza_order",
-            name="Pizza Order Creation Tool",
-            description="Helps with creating pizza orders",
-            tags=["pizza order creation"],
-            examples=["I want to order 2 pepperoni pizzas"],
-        )
-        agent_card = AgentCard(
-            name="pizza_seller_agent",
-            description="Helps with creating pizza orders",
-            # The URL provided here is for the sake of demo,
-            # in production you should use a proper domain name
-            url=f"http://{host}:{port}/",
-            version="1.0.0",
-            authentication=AgentAuthentication(schemes=["Bearer"]),
-            defaultInputModes=PizzaSellerAgent.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=PizzaSellerAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
-        )
-
-        notification_sender_auth = PushNotificationSenderAuth()
-        notification_sender_auth.generate_jwk()
-        server = A2AServer(
-            agent_card=agent_card,
-            task_manager=AgentTaskManager(
-                agent=PizzaSellerAgent(),
-                notification_sender_auth=notification_sender_auth,
-            ),
-            host=host,
-            port=port,
-            api_key=os.environ.get("API_KEY"),
-        )
-
-        server.app.add_route(
-            "/.well-known/jwks.json",
-            notification_sender_auth.handle_jwks_endpoint,
-            methods=["GET"],
-        )
-
-        logger.info(f"Starting server on {host}:{port}")
-        server.start()
+        if workers > 1:
+            serve_workers(host, port, jwk_path, task_store_path, workers, loop, http)
+        else:
+            server = build_server(host, port, jwk_path, task_store_path)
+            logger.info(f"Starting server on {host}:{port}")
+            server.start(loop=loop, http=http)
     except Exception as e:
         logger.error(f"An error occurred during server startup: {e}")
         exit(1)
 
 
+def serve_workers(host, port, jwk_path, task_store_path, workers, loop, http):
+    """Serves the agent in worker processes, each building its own server.
+
+    The workers share the signing key, the tasks and the metrics through
+    files. Those without an explicit path go in a temporary directory removed
+    on exit.
+    """
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    shared_dir = None
+    if not (jwk_path and task_store_path and metrics_dir):
+        shared_dir = tempfile.mkdtemp(prefix="pizza_agent_")
+    try:
+        metrics_dir = metrics_dir or os.path.join(shared_dir, "metrics")
+        os.makedirs(metrics_dir, exist_ok=True)
+        # The files of a previous run would be added to the new metrics.
+        for file_name in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(file_name)
+        os.environ.update(
+            HOST=host,
+            PORT=str(port),
+            JWK_PATH=jwk_path or os.path.join(shared_dir, "jwk.json"),
+            TASK_STORE_PATH=task_store_path or os.path.join(shared_dir, "tasks.db"),
+            PROMETHEUS_MULTIPROC_DIR=metrics_dir,
+        )
+        logger.info(f"Starting server on {host}:{port} with {workers} workers")
+        run_workers("app:create_app", host, port, workers, loop, http)
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,54 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import deque
+from typing import List, Tuple, Union
+from a2a_types import TaskArtifactUpdateEvent, TaskStatusUpdateEvent
+
+TaskEvent = Union[TaskStatusUpdateEvent, TaskArtifactUpdateEvent]
+
+
+class TaskEventLog:
+    """The latest status and artifact events of a task, numbered from 1.
+
+    The numbers are sent as SSE event ids, so that a client reconnecting with
+    the id of the last event it received gets the events it missed replayed.
+    Only the latest `size` events are kept.
+    """
+
+    def __init__(self, size: int):
+        self.events: deque[Tuple[int, TaskEvent]] = deque(maxlen=size)
+        self.last_event_id = 0
+
+    def append(self, event: TaskEvent) -> int:
+        """Adds an event and returns its id."""
+        self.last_event_id += 1
+        self.events.append((self.last_event_id, event))
+        return self.last_event_id
+
+    def since(self, last_event_id: int) -> List[Tuple[int, TaskEvent]]:
+        """Returns the kept events that came after `last_event_id`."""
+        return [
+            (event_id, event)
+            for event_id, event in self.events
+            if event_id > last_event_id
+        ]
+
+    def is_complete_since(self, last_event_id: int) -> bool:
+        """Whether no event after `last_event_id` was dropped from the log."""
+        if not self.events:
+            return last_event_id >= self.last_event_id
+        return self.events[0][0] <= last_event_id + 1
@@ -0,0 +1,101 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def is_multiprocess() -> bool:
+    """Whether the metrics are shared by several worker processes.
+
+    The workers then write their metrics to files in PROMETHEUS_MULTIPROC_DIR,
+    which must be set before this module is imported, and whichever worker
+    answers a scrape reports the metrics of all of them.
+    """
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def render() -> bytes:
+    """Returns the metrics in the Prometheus text format."""
+    if not is_multiprocess():
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def mark_process_dead():
+    """Drops the live gauges of this worker, called when it exits."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+REQUESTS = Counter(
+    "a2a_requests_total", "JSON-RPC requests handled.", ["method", "outcome"]
+)
+REQUEST_LATENCY = Histogram(
+    "a2a_request_duration_seconds",
+    "JSON-RPC request handling time.",
+    ["method"],
+    buckets=DEFAULT_BUCKETS,
+)
+TASK_STATE_TRANSITIONS = Counter(
+    "a2a_task_state_transitions_total", "Task state transitions.", ["state"]
+)
+AGENT_INVOKE_LATENCY = Histogram(
+    "a2a_agent_invoke_duration_seconds",
+    "Time spent running the agent.",
+    buckets=DEFAULT_BUCKETS,
+)
+PUSH_NOTIFICATION_LATENCY = Histogram(
+    "a2a_push_notification_duration_seconds",
+    "Time spent sending push notifications.",
+    buckets=DEFAULT_BUCKETS,
+)
+PUSH_NOTIFICATION_FAILURES = Counter(
+    "a2a_push_notification_failures_total", "Push notifications that failed to send."
+)
+# Summed over the live workers, each one counts its own subscribers.
+SSE_SUBSCRIBERS = Gauge(
+    "a2a_sse_subscribers", "Connected SSE subscribers.", multiprocess_mode="livesum"
+)
+SSE_EVENTS_DROPPED = Counter(
+    "a2a_sse_events_dropped_total",
+    "Events dropped from the queue of a slow SSE subscriber.",
+    ["reason"],
+)
+SSE_SLOW_SUBSCRIBERS_DISCONNECTED = Counter(
+    "a2a_sse_slow_subscribers_disconnected_total",
+    "SSE subscribers disconnected for falling behind.",
+)
+# The workers share the task store, the latest count taken is reported.
+TASK_STORE_SIZE = Gauge(
+    "a2a_task_store_size",
+    "Tasks held in the task store.",
+    multiprocess_mode="mostrecent",
+)
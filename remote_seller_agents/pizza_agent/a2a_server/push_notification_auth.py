@@ -26,8 +26,11 @@ import json
 import hashlib
 import httpx
 import logging
+import os
 
 from jwt import PyJWK, PyJWKClient
+import a2a_server.metrics as metrics
+import a2a_server.tracing as tracing
 
 logger = logging.getLogger(__name__)
 AUTH_HEADER_PREFIX = "Bearer "
@@ -76,6 +79,36 @@ class PushNotificationSenderAuth(PushNotificationAuth):
 
     def generate_jwk(self):
         key = jwk.JWK.generate(kty="RSA", size=2048, kid=str(uuid.uuid4()), use="sig")
+        self._use_jwk(key)
+
+    def load_jwk(self, path: str):
+        """Loads the signing key persisted at `path`, generating it on first use.
+
+        Reusing a persisted key skips the RSA key generation on every boot and
+        lets all workers and replicas of a seller sign with the same key.
+        """
+        if not os.path.exists(path):
+            key = jwk.JWK.generate(
+                kty="RSA", size=2048, kid=str(uuid.uuid4()), use="sig"
+            )
+            tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(key.export_private())
+            try:
+                # Linking fails if another process persisted its key first, in
+                # which case that key is the one to use.
+                os.link(tmp_path, path)
+                logger.info(f"Generated push-notification signing key at {path}")
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp_path)
+
+        with open(path) as f:
+            self._use_jwk(jwk.JWK.from_json(f.read()))
+
+    def _use_jwk(self, key: jwk.JWK):
         self.public_keys.append(key.export_public(as_dict=True))
         self.private_key_jwk = PyJWK.from_json(key.export_private())
 
@@ -103,17 +136,26 @@ class PushNotificationSenderAuth(PushNotificationAuth):
         )
 
     async def send_push_notification(self, url: str, data: dict[str, Any]):
-        jwt_token = self._generate_jwt(data)
-        headers = {"Authorization": f"Bearer {jwt_token}"}
-        async with httpx.AsyncClient(timeout=10) as client:
-            try:
-                response = await client.post(url, json=data, headers=headers)
-                response.raise_for_status()
-                logger.info(f"Push-notification sent for URL: {url}")
-            except Exception as e:
-                logger.warning(
-                    f"Error during sending push-notification for URL {url}: {e}"
-                )
+        start_time = time.perf_counter()
+        with tracing.start_span(
+            "push_notification",
+            attributes={"a2a.task_id": data.get("id"), "a2a.push_url": url},
+        ) as span:
+            jwt_token = self._generate_jwt(data)
+            headers = tracing.inject_context({"Authorization": f"Bearer {jwt_token}"})
+            async with httpx.AsyncClient(timeout=10) as client:
+                try:
+                    response = await client.post(url, json=data, headers=headers)
+                    response.raise_for_status()
+                    logger.info(f"Push-notification sent for URL: {url}")
+                except Exception as e:
+                    metrics.PUSH_NOTIFICATION_FAILURES.inc()
+                    if span is not None:
+                        span.record_exception(e)
+                    logger.warning(
+                        f"Error during sending push-notification for URL {url}: {e}"
+                    )
+        metrics.PUSH_NOTIFICATION_LATENCY.observe(time.perf_counter() - start_time)
 
 
 class PushNotificationReceiverAuth(PushNotificationAuth):
@@ -127,7 +169,7 @@ class PushNotificationReceiverAuth(PushNotificationAuth):
     async def verify_push_notification(self, request: Request) -> bool:
         auth_header = request.headers.get("Authorization")
         if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
-            print("Invalid authorization header")
+            logger.warning("Invalid authorization header")
             return False
 
         token = auth_header[len(AUTH_HEADER_PREFIX) :]
@@ -15,7 +15,7 @@ limitations under the License.
 """
 
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 from sse_starlette.sse import EventSourceResponse
 from starlette.requests import Request
 from a2a_types import (
@@ -34,16 +34,54 @@ from a2a_types import (
     SendTaskStreamingRequest,
 )
 from pydantic import ValidationError
+from contextlib import asynccontextmanager
 import json
 from typing import AsyncIterable, Any
 from a2a_server.task_manager import TaskManager
+import a2a_server.metrics as metrics
+import a2a_server.tracing as tracing
 
 import logging
 import base64
+import time
 
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    yield
+    # A worker exiting drops its live gauges from the shared metrics.
+    metrics.mark_process_dead()
+
+
+def run_workers(
+    app_factory: str,
+    host: str,
+    port: int,
+    workers: int,
+    loop: str = "auto",
+    http: str = "auto",
+):
+    """Serves the app built by `app_factory` in `workers` uvicorn processes.
+
+    Each worker process imports the factory and builds its own app, so the
+    calling process does not need to build one.
+    """
+    import uvicorn
+
+    uvicorn.run(
+        app_factory,
+        factory=True,
+        workers=workers,
+        host=host,
+        port=port,
+        loop=loop,
+        http=http,
+        log_config=None,
+    )
+
+
 class A2AServer:
     def __init__(
         self,
@@ -64,11 +102,12 @@ class A2AServer:
         self.api_key = api_key
         self.auth_username = auth_username
         self.auth_password = auth_password
-        self.app = Starlette()
+        self.app = Starlette(lifespan=lifespan)
         self.app.add_route(self.endpoint, self._process_request, methods=["POST"])
         self.app.add_route(
             "/.well-known/agent.json", self._get_agent_card, methods=["GET"]
         )
+        self.app.add_route("/metrics", self._get_metrics, methods=["GET"])
 
         if len(self.agent_card.authentication.schemes) > 1:
             raise ValueError("Only one authentication scheme is supported for now")
@@ -90,7 +129,26 @@ class A2AServer:
         else:
             raise ValueError("Unsupported authentication scheme")
 
-    def start(self):
+    def start(
+        self,
+        workers: int = 1,
+        app_factory: str | None = None,
+        loop: str = "auto",
+        http: str = "auto",
+    ):
+        """Serves the app with uvicorn.
+
+        Args:
+            workers: Number of worker processes.
+            app_factory: Import string of a function building the app, e.g.
+                "app:create_app". Required with more than one worker since each
+                worker process builds its own app.
+            loop: Event loop implementation, "auto", "asyncio" or "uvloop".
+            http: HTTP protocol implementation, "auto", "h11" or "httptools".
+
+        Uvicorn logs go through the root logger, see
+        `a2a_server.logging_config.setup_logging`.
+        """
         if self.agent_card is None:
             raise ValueError("agent_card is not defined")
 
@@ -99,11 +157,26 @@ class A2AServer:
 
         import uvicorn
 
-        uvicorn.run(self.app, host=self.host, port=self.port)
+        if workers > 1:
+            if app_factory is None:
+                raise ValueError("app_factory is required to run multiple workers")
+            run_workers(app_factory, self.host, self.port, workers, loop, http)
+        else:
+            uvicorn.run(
+                self.app,
+                host=self.host,
+                port=self.port,
+                loop=loop,
+                http=http,
+                log_config=None,
+            )
 
     def _get_agent_card(self, request: Request) -> JSONResponse:
         return JSONResponse(self.agent_card.model_dump(exclude_none=True))
 
+    def _get_metrics(self, request: Request) -> Response:
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
     def verify_bearer_token(self, token):
         """Verify the provided bearer token against the expected token."""
         # Simple token comparison for demonstration
@@ -160,43 +233,85 @@ class A2AServer:
         # Check authentication based on configured auth scheme
         is_valid, error_message = await self.verify_auth_header(request)
         if not is_valid:
+            metrics.REQUESTS.labels(method="unknown", outcome="unauthorized").inc()
             return JSONResponse({"error": error_message}, status_code=401)
 
-        try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_python(body)
-            print(json_rpc_request)
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
-                )
-            else:
-                logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
-                raise ValueError(f"Unexpected request type: {type(request)}")
-
-            return self._create_response(result)
+        method = "unknown"
+        outcome = "exception"
+        streamed = False
+        start_time = time.perf_counter()
+        # Continues the trace of the caller from its W3C traceparent header.
+        with tracing.start_span(
+            "a2a.server",
+            context=tracing.extract_context(request.headers),
+            server=True,
+        ) as span:
+            try:
+                body = await request.json()
+                json_rpc_request = A2ARequest.validate_python(body)
+                method = json_rpc_request.method
+                task_id = getattr(json_rpc_request.params, "id", None)
+                if span is not None:
+                    span.update_name(f"a2a.server {method}")
+                    span.set_attribute("a2a.method", method)
+                    if task_id:
+                        span.set_attribute("a2a.task_id", task_id)
+                logger.info("Received %s request", method, extra={"task_id": task_id})
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Request payload", extra={"payload": body})
+
+                if isinstance(json_rpc_request, GetTaskRequest):
+                    result = await self.task_manager.on_get_task(json_rpc_request)
+                elif isinstance(json_rpc_request, SendTaskRequest):
+                    result = await self.task_manager.on_send_task(json_rpc_request)
+                elif isinstance(json_rpc_request, SendTaskStreamingRequest):
+                    result = await self.task_manager.on_send_task_subscribe(
+                        json_rpc_request
+                    )
+                elif isinstance(json_rpc_request, CancelTaskRequest):
+                    result = await self.task_manager.on_cancel_task(json_rpc_request)
+                elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
+                    result = await self.task_manager.on_set_task_push_notification(
+                        json_rpc_request
+                    )
+                elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
+                    result = await self.task_manager.on_get_task_push_notification(
+                        json_rpc_request
+                    )
+                elif isinstance(json_rpc_request, TaskResubscriptionRequest):
+                    result = await self.task_manager.on_resubscribe_to_task(
+                        json_rpc_request,
+                        last_event_id=self._get_last_event_id(request),
+                    )
+                else:
+                    logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
+                    raise ValueError(f"Unexpected request type: {type(request)}")
+
+                response = self._create_response(result, method, start_time)
+                outcome = "error" if getattr(result, "error", None) else "ok"
+                # Streams are measured by their event generator once they end.
+                streamed = isinstance(response, EventSourceResponse)
+                return response
 
-        except Exception as e:
-            return self._handle_exception(e)
+            except Exception as e:
+                if span is not None:
+                    span.record_exception(e)
+                return self._handle_exception(e)
+            finally:
+                metrics.REQUESTS.labels(method=method, outcome=outcome).inc()
+                if not streamed:
+                    metrics.REQUEST_LATENCY.labels(method=method).observe(
+                        time.perf_counter() - start_time
+                    )
+
+    def _get_last_event_id(self, request: Request) -> int | None:
+        # Sent by SSE clients reconnecting after a dropped connection.
+        last_event_id = request.headers.get("Last-Event-ID")
+        try:
+            return int(last_event_id) if last_event_id else None
+        except ValueError:
+            logger.warning(f"Invalid Last-Event-ID header: {last_event_id}")
+            return None
 
     def _handle_exception(self, e: Exception) -> JSONResponse:
         if isinstance(e, json.decoder.JSONDecodeError):
@@ -210,12 +325,32 @@ class A2AServer:
         response = JSONRPCResponse(id=None, error=json_rpc_error)
         return JSONResponse(response.model_dump(exclude_none=True), status_code=400)
 
-    def _create_response(self, result: Any) -> JSONResponse | EventSourceResponse:
+    def _create_response(
+        self,
+        result: Any,
+        method: str = "unknown",
+        start_time: float | None = None,
+    ) -> JSONResponse | EventSourceResponse:
         if isinstance(result, AsyncIterable):
+            if start_time is None:
+                start_time = time.perf_counter()
 
             async def event_generator(result) -> AsyncIterable[dict[str, str]]:
-                async for item in result:
-                    yield {"data": item.model_dump_json(exclude_none=True)}
+                try:
+                    async for item in result:
+                        # Task managers may yield (event id, item) pairs.
+                        event_id, item = (
+                            item if isinstance(item, tuple) else (None, item)
+                        )
+                        event = {"data": item.model_dump_json(exclude_none=True)}
+                        if event_id is not None:
+                            event["id"] = str(event_id)
+                        yield event
+                finally:
+                    # Until the stream ends or the client disconnects.
+                    metrics.REQUEST_LATENCY.labels(method=method).observe(
+                        time.perf_counter() - start_time
+                    )
 
             return EventSourceResponse(event_generator(result))
         elif isinstance(result, JSONRPCResponse):
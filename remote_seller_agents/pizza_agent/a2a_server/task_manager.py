@@ -15,7 +15,9 @@ limitations under the License.
 """
 
 from abc import ABC, abstractmethod
-from typing import Union, AsyncIterable, List
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Coroutine, Union, AsyncIterable, List
 from a2a_types import (
     Task,
     JSONRPCResponse,
@@ -42,15 +44,28 @@ from a2a_types import (
     Artifact,
     PushNotificationConfig,
     TaskStatusUpdateEvent,
+    TaskArtifactUpdateEvent,
     JSONRPCError,
     TaskPushNotificationConfig,
     InternalError,
 )
+from a2a_server.event_log import TaskEventLog
+from a2a_server.subscriber_queue import DROP_OLDEST, SubscriberQueue
+from a2a_server.task_store import SqliteStore
+import a2a_server.metrics as metrics
 from a2a_server.utils import new_not_implemented_error
 import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
+FINAL_STATES = {TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED}
+# States a task is still worked on in, any other one ends its event stream.
+ACTIVE_STATES = {TaskState.SUBMITTED, TaskState.WORKING}
+DEFAULT_EVENT_LOG_SIZE = 100
+DEFAULT_MAX_EVENT_LOGS = 1000
+# Large enough for a resubscription to replay a whole event log.
+DEFAULT_SSE_QUEUE_SIZE = DEFAULT_EVENT_LOG_SIZE
 
 
 class TaskManager(ABC):
@@ -86,18 +101,54 @@ class TaskManager(ABC):
 
     @abstractmethod
     async def on_resubscribe_to_task(
-        self, request: TaskResubscriptionRequest
+        self, request: TaskResubscriptionRequest, last_event_id: int | None = None
     ) -> Union[AsyncIterable[SendTaskResponse], JSONRPCResponse]:
         pass
 
 
 class InMemoryTaskManager(TaskManager):
-    def __init__(self):
-        self.tasks: dict[str, Task] = {}
-        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+    def __init__(
+        self,
+        store_path: str | None = None,
+        event_log_size: int = DEFAULT_EVENT_LOG_SIZE,
+        max_event_logs: int = DEFAULT_MAX_EVENT_LOGS,
+        sse_queue_size: int | None = None,
+        sse_overflow_policy: str | None = None,
+    ):
+        """Keeps tasks in memory by default.
+
+        With `store_path`, tasks and push notification configs are kept in that
+        SQLite file instead, so that several worker processes share them.
+
+        The latest `event_log_size` events of the latest `max_event_logs` tasks
+        are kept in memory, to be replayed to resubscribing SSE clients.
+
+        Each SSE subscriber queues up to `sse_queue_size` events, beyond which
+        `sse_overflow_policy` applies (see SubscriberQueue). They default to the
+        SSE_QUEUE_SIZE and SSE_OVERFLOW_POLICY environment variables.
+        """
+        self.tasks: MutableMapping[str, Task] = {}
+        self.push_notification_infos: MutableMapping[str, PushNotificationConfig] = {}
+        if store_path:
+            self.tasks = SqliteStore(store_path, "tasks", Task)
+            self.push_notification_infos = SqliteStore(
+                store_path, "push_notification_infos", PushNotificationConfig
+            )
         self.lock = asyncio.Lock()
-        self.task_sse_subscribers: dict[str, List[asyncio.Queue]] = {}
+        self.task_sse_subscribers: dict[str, List[SubscriberQueue]] = {}
+        self.task_event_logs: OrderedDict[str, TaskEventLog] = OrderedDict()
+        self.event_log_size = event_log_size
+        self.max_event_logs = max_event_logs
+        if sse_queue_size is None:
+            sse_queue_size = int(os.getenv("SSE_QUEUE_SIZE", DEFAULT_SSE_QUEUE_SIZE))
+        if sse_overflow_policy is None:
+            sse_overflow_policy = os.getenv("SSE_OVERFLOW_POLICY", DROP_OLDEST)
+        self.sse_queue_size = sse_queue_size
+        self.sse_overflow_policy = sse_overflow_policy
+        # Agent runs of the tasks processed in the background by this process.
+        self.running_tasks: dict[str, asyncio.Task] = {}
         self.subscriber_lock = asyncio.Lock()
+        metrics.TASK_STORE_SIZE.set(len(self.tasks))
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f"Getting task {request.params.id}")
@@ -123,7 +174,25 @@ class InMemoryTaskManager(TaskManager):
             if task is None:
                 return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
 
-        return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+        running_task = self.running_tasks.get(task_id_params.id)
+        if task.status.state in FINAL_STATES or (
+            # The agent is running in another worker process.
+            running_task is None
+            and task.status.state in (TaskState.SUBMITTED, TaskState.WORKING)
+        ):
+            return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+
+        if running_task is not None:
+            # A thread running a synchronous agent finishes its current call,
+            # but its result is dropped.
+            running_task.cancel()
+        task = await self.update_store(
+            task_id_params.id, TaskStatus(state=TaskState.CANCELED), None
+        )
+        await self.send_task_notification(task)
+        return CancelTaskResponse(
+            id=request.id, result=self.append_task_history(task, None)
+        )
 
     @abstractmethod
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
@@ -135,6 +204,24 @@ class InMemoryTaskManager(TaskManager):
     ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
         pass
 
+    def start_background_task(
+        self, task_id: str, coroutine: Coroutine[Any, Any, None]
+    ) -> asyncio.Task:
+        """Runs the work of a task in the background, keeping track of it."""
+        background_task = asyncio.create_task(coroutine)
+        self.running_tasks[task_id] = background_task
+
+        def forget(_):
+            if self.running_tasks.get(task_id) is background_task:
+                del self.running_tasks[task_id]
+
+        background_task.add_done_callback(forget)
+        return background_task
+
+    async def send_task_notification(self, task: Task):
+        """Sends the task to its push notification URL, if push is supported."""
+        pass
+
     async def set_push_notification_info(
         self, task_id: str, notification_config: PushNotificationConfig
     ):
@@ -222,15 +309,32 @@ class InMemoryTaskManager(TaskManager):
                     history=[task_send_params.message],
                 )
                 self.tasks[task_send_params.id] = task
+                metrics.TASK_STORE_SIZE.set(len(self.tasks))
+                metrics.TASK_STATE_TRANSITIONS.labels(
+                    state=TaskState.SUBMITTED.value
+                ).inc()
             else:
                 task.history.append(task_send_params.message)
+                # Write back, a shared store hands out copies.
+                self.tasks[task_send_params.id] = task
 
             return task
 
     async def on_resubscribe_to_task(
-        self, request: TaskResubscriptionRequest
+        self, request: TaskResubscriptionRequest, last_event_id: int | None = None
     ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
-        return new_not_implemented_error(request.id)
+        """Streams the events after `last_event_id`, then the live ones."""
+        task_query_params: TaskQueryParams = request.params
+        async with self.lock:
+            if task_query_params.id not in self.tasks:
+                return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+
+        return self.dequeue_events_for_sse(
+            request.id,
+            task_query_params.id,
+            is_resubscribe=True,
+            last_event_id=last_event_id,
+        )
 
     async def update_store(
         self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
@@ -243,6 +347,7 @@ class InMemoryTaskManager(TaskManager):
                 raise ValueError(f"Task {task_id} not found")
 
             task.status = status
+            metrics.TASK_STATE_TRANSITIONS.labels(state=status.state.value).inc()
 
             if status.message is not None:
                 task.history.append(status.message)
@@ -252,7 +357,19 @@ class InMemoryTaskManager(TaskManager):
                     task.artifacts = []
                 task.artifacts.extend(artifacts)
 
-            return task
+            self.tasks[task_id] = task
+
+        for artifact in artifacts or []:
+            await self.enqueue_events_for_sse(
+                task_id, TaskArtifactUpdateEvent(id=task_id, artifact=artifact)
+            )
+        await self.enqueue_events_for_sse(
+            task_id,
+            TaskStatusUpdateEvent(
+                id=task_id, status=status, final=status.state not in ACTIVE_STATES
+            ),
+        )
+        return task
 
     def append_task_history(self, task: Task, historyLength: int | None):
         new_task = task.model_copy()
@@ -263,41 +380,120 @@ class InMemoryTaskManager(TaskManager):
 
         return new_task
 
-    async def setup_sse_consumer(self, task_id: str, is_resubscribe: bool = False):
+    async def setup_sse_consumer(
+        self,
+        task_id: str,
+        is_resubscribe: bool = False,
+        last_event_id: int | None = None,
+    ):
+        """Returns the queue of a new SSE subscriber of the task.
+
+        On resubscription, the logged events after `last_event_id` are queued
+        first. If some were dropped from the log, or published by another worker
+        process, the artifacts and status of the task are queued instead.
+        """
         async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                if is_resubscribe:
-                    raise ValueError("Task not found for resubscription")
+            sse_event_queue = SubscriberQueue(
+                self.sse_queue_size, self.sse_overflow_policy
+            )
+            if is_resubscribe:
+                last_event_id = last_event_id or 0
+                event_log = self.task_event_logs.get(task_id)
+                if event_log is not None and event_log.is_complete_since(last_event_id):
+                    missed_events = event_log.since(last_event_id)
                 else:
-                    self.task_sse_subscribers[task_id] = []
-
-            sse_event_queue = asyncio.Queue(maxsize=0)  # <=0 is unlimited
-            self.task_sse_subscribers[task_id].append(sse_event_queue)
+                    missed_events = None
+                task = self.tasks.get(task_id)
+                if missed_events:
+                    for missed_event in missed_events:
+                        sse_event_queue.put_nowait(missed_event)
+                elif task is not None and (
+                    missed_events is None or task.status.state not in ACTIVE_STATES
+                ):
+                    # Sent without event ids, the client keeps its last one.
+                    for event in self._snapshot_events(task, missed_events is None):
+                        sse_event_queue.put_nowait((None, event))
+
+            self.task_sse_subscribers.setdefault(task_id, []).append(sse_event_queue)
+            metrics.SSE_SUBSCRIBERS.inc()
             return sse_event_queue
 
+    def _snapshot_events(
+        self, task: Task, with_artifacts: bool
+    ) -> List[TaskStatusUpdateEvent | TaskArtifactUpdateEvent]:
+        """Returns events bringing a subscriber up to the current task."""
+        events = []
+        if with_artifacts:
+            events = [
+                TaskArtifactUpdateEvent(id=task.id, artifact=artifact)
+                for artifact in task.artifacts or []
+            ]
+        events.append(
+            TaskStatusUpdateEvent(
+                id=task.id,
+                status=task.status,
+                final=task.status.state not in ACTIVE_STATES,
+            )
+        )
+        return events
+
     async def enqueue_events_for_sse(self, task_id, task_update_event):
-        async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                return
+        """Logs a task event and queues it for the SSE subscribers of the task.
 
-            current_subscribers = self.task_sse_subscribers[task_id]
-            for subscriber in current_subscribers:
-                await subscriber.put(task_update_event)
+        Errors are sent to the subscribers without being logged. Queuing never
+        waits, so a slow subscriber does not hold up the others.
+        """
+        async with self.subscriber_lock:
+            event_id = None
+            if not isinstance(task_update_event, JSONRPCError):
+                event_log = self.task_event_logs.get(task_id)
+                if event_log is None:
+                    event_log = TaskEventLog(self.event_log_size)
+                    self.task_event_logs[task_id] = event_log
+                    if len(self.task_event_logs) > self.max_event_logs:
+                        self.task_event_logs.popitem(last=False)
+                self.task_event_logs.move_to_end(task_id)
+                event_id = event_log.append(task_update_event)
+
+            subscribers = list(self.task_sse_subscribers.get(task_id, []))
+
+        # Nothing is awaited since the lock was released, so the subscribers
+        # still get the events in order.
+        for subscriber in subscribers:
+            subscriber.put_nowait((event_id, task_update_event))
 
     async def dequeue_events_for_sse(
-        self, request_id, task_id, sse_event_queue: asyncio.Queue
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        self,
+        request_id,
+        task_id,
+        is_resubscribe: bool = False,
+        last_event_id: int | None = None,
+    ) -> AsyncIterable[tuple[int | None, SendTaskStreamingResponse]]:
+        """Yields the queued events with their id, until the final one.
+
+        The subscriber is only set up once the stream is iterated, so that a
+        stream which is never sent does not stay subscribed.
+        """
+        sse_event_queue = await self.setup_sse_consumer(
+            task_id, is_resubscribe, last_event_id
+        )
         try:
             while True:
-                event = await sse_event_queue.get()
+                event_id, event = await sse_event_queue.get()
                 if isinstance(event, JSONRPCError):
-                    yield SendTaskStreamingResponse(id=request_id, error=event)
+                    yield event_id, SendTaskStreamingResponse(
+                        id=request_id, error=event
+                    )
                     break
 
-                yield SendTaskStreamingResponse(id=request_id, result=event)
+                yield event_id, SendTaskStreamingResponse(id=request_id, result=event)
                 if isinstance(event, TaskStatusUpdateEvent) and event.final:
                     break
         finally:
             async with self.subscriber_lock:
-                if task_id in self.task_sse_subscribers:
-                    self.task_sse_subscribers[task_id].remove(sse_event_queue)
+                subscribers = self.task_sse_subscribers.get(task_id, [])
+                if sse_event_queue in subscribers:
+                    subscribers.remove(sse_event_queue)
+                if not subscribers:
+                    self.task_sse_subscribers.pop(task_id, None)
+                metrics.SSE_SUBSCRIBERS.dec()
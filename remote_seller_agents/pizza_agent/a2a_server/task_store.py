@@ -0,0 +1,85 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections.abc import MutableMapping
+from typing import Iterator, Type
+from pydantic import BaseModel
+import sqlite3
+import threading
+
+
+class SqliteStore(MutableMapping):
+    """A dict-like store of pydantic models persisted in a SQLite table.
+
+    Used in place of a plain dict when several worker processes serve the same
+    agent, so that every worker sees the tasks created by the others. Values are
+    copies, so a model mutated after being read must be assigned back.
+    """
+
+    def __init__(self, path: str, table: str, model: Type[BaseModel]):
+        self.table = table
+        self.model = model
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def __getitem__(self, key: str) -> BaseModel:
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT value FROM {self.table} WHERE id = ?", (key,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self.model.model_validate_json(row[0])
+
+    def __setitem__(self, key: str, value: BaseModel):
+        with self.lock:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (id, value) VALUES (?, ?)",
+                (key, value.model_dump_json()),
+            )
+
+    def __delitem__(self, key: str):
+        with self.lock:
+            cursor = self.connection.execute(
+                f"DELETE FROM {self.table} WHERE id = ?", (key,)
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT 1 FROM {self.table} WHERE id = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self.lock:
+            rows = self.connection.execute(f"SELECT id FROM {self.table}").fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()[0]
@@ -0,0 +1,156 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping
+import logging
+import os
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:
+    # Tracing is optional, spans are no-ops when OpenTelemetry is not installed.
+    propagate = None
+    trace = None
+
+logger = logging.getLogger(__name__)
+TRACER_NAME = "a2a_server"
+
+
+def setup_tracing(service_name: str) -> bool:
+    """Exports spans if an exporter is configured in the environment.
+
+    Spans are sent to the OTLP/HTTP collector at OTEL_EXPORTER_OTLP_ENDPOINT,
+    or appended as JSON lines to the file at TRACES_FILE. Without either, the
+    default no-op tracer provider is kept.
+
+    Returns:
+        Whether spans are exported.
+    """
+    otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    traces_file = os.getenv("TRACES_FILE")
+    if not otlp_endpoint and not traces_file:
+        return False
+    if trace is None:
+        logger.warning("Tracing is configured but OpenTelemetry is not installed")
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+        )
+    except ImportError:
+        logger.warning("Tracing is configured but opentelemetry-sdk is not installed")
+        return False
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(
+            resource=Resource.create(
+                {"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}
+            )
+        )
+        trace.set_tracer_provider(provider)
+
+    if otlp_endpoint:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+
+            # Reads the endpoint and headers from the OTEL_EXPORTER_OTLP_* variables.
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        except ImportError:
+            logger.warning(
+                "OTEL_EXPORTER_OTLP_ENDPOINT is set but "
+                "opentelemetry-exporter-otlp-proto-http is not installed"
+            )
+    if traces_file:
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                _json_lines_file_exporter(ConsoleSpanExporter, traces_file)
+            )
+        )
+    return True
+
+
+def _json_lines_file_exporter(exporter_class: Any, path: str) -> Any:
+    """A console exporter appending spans as JSON lines to the file at `path`.
+
+    The file is closed when the exporter is shut down, which the tracer
+    provider does on exit after flushing the pending spans.
+    """
+
+    class JsonLinesFileExporter(exporter_class):
+        def __init__(self):
+            self.file = open(path, "a")
+            super().__init__(
+                out=self.file,
+                formatter=lambda span: span.to_json(indent=None) + "\n",
+            )
+
+        def shutdown(self):
+            super().shutdown()
+            self.file.close()
+
+    return JsonLinesFileExporter()
+
+
+def extract_context(headers: Mapping[str, str]) -> Any:
+    """Returns the trace context propagated in W3C `traceparent` headers."""
+    if propagate is None:
+        return None
+    return propagate.extract(headers)
+
+
+def inject_context(headers: dict[str, str]) -> dict[str, str]:
+    """Adds the current trace context to outgoing request headers."""
+    if propagate is not None:
+        propagate.inject(headers)
+    return headers
+
+
+@contextmanager
+def start_span(
+    name: str,
+    context: Any = None,
+    server: bool = False,
+    attributes: dict[str, Any] | None = None,
+) -> Iterator[Any]:
+    """Starts a span as the current span, a no-op without OpenTelemetry.
+
+    Args:
+        name: The span name.
+        context: The parent context, e.g. from `extract_context`. Defaults to
+            the current span.
+        server: Whether the span handles an incoming request.
+        attributes: Attributes set on the span, None values are skipped.
+    """
+    if trace is None:
+        yield None
+        return
+
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(
+        name,
+        context=context,
+        kind=trace.SpanKind.SERVER if server else trace.SpanKind.INTERNAL,
+        attributes={k: v for k, v in (attributes or {}).items() if v is not None},
+    ) as span:
+        yield span
@@ -18,6 +18,7 @@ from a2a_types import (
     JSONRPCResponse,
     ContentTypeNotSupportedError,
     UnsupportedOperationError,
+    TaskSendParams,
 )
 from typing import List
 
@@ -42,3 +43,13 @@ def new_incompatible_types_error(request_id):
 
 def new_not_implemented_error(request_id):
     return JSONRPCResponse(id=request_id, error=UnsupportedOperationError())
+
+
+def is_blocking(task_send_params: TaskSendParams) -> bool:
+    """Whether the client waits for the agent in the `tasks/send` request.
+
+    Clients opt out with `"blocking": false` in the params metadata, `tasks/send`
+    then returns the working task right away.
+    """
+    metadata = task_send_params.metadata or {}
+    return metadata.get("blocking", True) is not False
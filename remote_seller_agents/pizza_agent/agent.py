@@ -14,19 +14,16 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from langchain_google_vertexai import ChatVertexAI
-from langchain_core.tools import tool
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
 from typing import Literal
 from pydantic import BaseModel
 import uuid
 from dotenv import load_dotenv
+import a2a_server.tracing as tracing
+import logging
 import os
 
 load_dotenv()
-
-memory = MemorySaver()
+logger = logging.getLogger(__name__)
 
 
 class ResponseFormat(BaseModel):
@@ -48,7 +45,6 @@ class Order(BaseModel):
     order_items: list[OrderItem]
 
 
-@tool
 def create_pizza_order(order_items: list[OrderItem]) -> str:
     """
     Creates a new pizza order with the given order items.
@@ -59,15 +55,14 @@ def create_pizza_order(order_items: list[OrderItem]) -> str:
     Returns:
         str: A message indicating that the order has been created.
     """
-    try:
-        order_id = str(uuid.uuid4())
-        order = Order(order_id=order_id, status="created", order_items=order_items)
-        print("===")
-        print(f"order created: {order}")
-        print("===")
-    except Exception as e:
-        print(f"Error creating order: {e}")
-        return f"Error creating order: {e}"
+    with tracing.start_span("tool_call [create_pizza_order]"):
+        try:
+            order_id = str(uuid.uuid4())
+            order = Order(order_id=order_id, status="created", order_items=order_items)
+            logger.info("Order created", extra={"order": order.model_dump()})
+        except Exception as e:
+            logger.error(f"Error creating order: {e}")
+            return f"Error creating order: {e}"
     return f"Order {order.model_dump()} has been created"
 
 
@@ -104,21 +99,41 @@ Provided below is the available pizza menu and it's related price:
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
     def __init__(self):
+        self.model = None
+        self.tools = None
+        self.graph = None
+
+    def warm_up(self):
+        """Imports LangGraph and builds the model and graph once.
+
+        LangChain, LangGraph and the Vertex AI client take seconds to import, so
+        they are only loaded here instead of at module import time. Call it
+        before serving requests.
+        """
+        if self.graph is not None:
+            return
+
+        from langchain_google_vertexai import ChatVertexAI
+        from langchain_core.tools import tool
+        from langgraph.prebuilt import create_react_agent
+        from langgraph.checkpoint.memory import MemorySaver
+
         self.model = ChatVertexAI(
             model="gemini-2.0-flash",
             location=os.getenv("GCLOUD_LOCATION"),
             project=os.getenv("GCLOUD_PROJECT_ID"),
         )
-        self.tools = [create_pizza_order]
+        self.tools = [tool(create_pizza_order)]
         self.graph = create_react_agent(
             self.model,
             tools=self.tools,
-            checkpointer=memory,
+            checkpointer=MemorySaver(),
             prompt=self.SYSTEM_INSTRUCTION,
             response_format=ResponseFormat,
         )
 
     def invoke(self, query, sessionId) -> str:
+        self.warm_up()
         config = {"configurable": {"thread_id": sessionId}}
         self.graph.invoke({"messages": [("user", query)]}, config)
         return self.get_agent_response(config)
@@ -32,9 +32,13 @@ from a2a_types import (
 from a2a_server.task_manager import InMemoryTaskManager
 from agent import PizzaSellerAgent
 from a2a_server.push_notification_auth import PushNotificationSenderAuth
+import a2a_server.metrics as metrics
+import a2a_server.tracing as tracing
 import a2a_server.utils as utils
 from typing import Union
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -44,8 +48,9 @@ class AgentTaskManager(InMemoryTaskManager):
         self,
         agent: PizzaSellerAgent,
         notification_sender_auth: PushNotificationSenderAuth,
+        store_path: str | None = None,
     ):
-        super().__init__()
+        super().__init__(store_path=store_path)
         self.agent = agent
         self.notification_sender_auth = notification_sender_auth
 
@@ -81,6 +86,11 @@ class AgentTaskManager(InMemoryTaskManager):
         validation_error = self._validate_request(request)
         if validation_error:
             return SendTaskResponse(id=request.id, error=validation_error.error)
+        if request.params.id in self.running_tasks:
+            return SendTaskResponse(
+                id=request.id,
+                error=InvalidParamsError(message="Task is already running"),
+            )
 
         await self.upsert_task(request.params)
 
@@ -100,14 +110,76 @@ class AgentTaskManager(InMemoryTaskManager):
         )
         await self.send_task_notification(task)
 
-        task_send_params: TaskSendParams = request.params
+        if not utils.is_blocking(request.params):
+            # The result is delivered through tasks/get and push notifications.
+            self.start_background_task(request.params.id, self._run_agent(request))
+            return SendTaskResponse(
+                id=request.id,
+                result=self.append_task_history(task, request.params.historyLength),
+            )
+
+        # Tracked like a background task so that tasks/cancel can stop it.
+        agent_run = self.start_background_task(
+            request.params.id, self._invoke_agent(request.params)
+        )
+        try:
+            agent_response = await agent_run
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            # Cancelled with tasks/cancel, the task is already marked canceled.
+            async with self.lock:
+                task = self.tasks[request.params.id]
+            return SendTaskResponse(
+                id=request.id,
+                result=self.append_task_history(task, request.params.historyLength),
+            )
+        return await self._process_agent_response(request, agent_response)
+
+    async def _invoke_agent(self, task_send_params: TaskSendParams) -> dict:
         query = self._get_user_query(task_send_params)
+        start_time = time.perf_counter()
+        with tracing.start_span(
+            "agent.invoke",
+            attributes={
+                "a2a.task_id": task_send_params.id,
+                "a2a.session_id": task_send_params.sessionId,
+            },
+        ):
+            try:
+                # The agent is synchronous, running it in a thread keeps the
+                # server responsive while the LLM works.
+                return await asyncio.to_thread(
+                    self.agent.invoke, query, task_send_params.sessionId
+                )
+            except Exception as e:
+                logger.error(f"Error invoking agent: {e}")
+                raise ValueError(f"Error invoking agent: {e}")
+            finally:
+                metrics.AGENT_INVOKE_LATENCY.observe(time.perf_counter() - start_time)
+
+    async def _run_agent(self, request: SendTaskRequest):
+        """Runs the agent of a non-blocking request and stores its result.
+
+        Nobody awaits this background task, so any error is stored as a failed
+        task instead of being left in an unretrieved exception.
+        """
         try:
-            agent_response = self.agent.invoke(query, task_send_params.sessionId)
+            agent_response = await self._invoke_agent(request.params)
+            await self._process_agent_response(request, agent_response)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error invoking agent: {e}")
-            raise ValueError(f"Error invoking agent: {e}")
-        return await self._process_agent_response(request, agent_response)
+            logger.error(f"Error running task {request.params.id}: {e}")
+            task = await self.update_store(
+                request.params.id,
+                TaskStatus(
+                    state=TaskState.FAILED,
+                    message=Message(role="agent", parts=[TextPart(text=str(e))]),
+                ),
+                None,
+            )
+            await self.send_task_notification(task)
 
     async def on_send_task_subscribe(self, *args, **kwargs):
         raise NotImplementedError()
@@ -0,0 +1,164 @@
+import asyncio
+import threading
+
+from a2a_types import (
+    CancelTaskRequest,
+    Message,
+    PushNotificationConfig,
+    SendTaskRequest,
+    TaskIdParams,
+    TaskNotCancelableError,
+    TaskQueryParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from task_manager import AgentTaskManager
+
+
+class FakeAgent:
+    def __init__(self, response=None, error: Exception | None = None):
+        self.response = response
+        self.error = error
+
+    def invoke(self, query: str, session_id: str) -> dict:
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class BlockingAgent:
+    """Answers once `release` is set, like an agent waiting for the LLM."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def invoke(self, query: str, session_id: str) -> dict:
+        self.release.wait(timeout=5)
+        return {"content": "ordered", "require_user_input": False}
+
+
+class FakeNotificationSender:
+    def __init__(self):
+        self.states = []
+
+    async def verify_push_notification_url(self, url: str) -> bool:
+        return True
+
+    async def send_push_notification(self, url: str, data: dict):
+        self.states.append(data["status"]["state"])
+
+
+def send_request(task_id: str, push_url: str | None = None) -> SendTaskRequest:
+    return SendTaskRequest(
+        params=TaskSendParams(
+            id=task_id,
+            message=Message(role="user", parts=[TextPart(text="2 items")]),
+            pushNotification=push_url and PushNotificationConfig(url=push_url),
+            metadata={"blocking": False},
+        )
+    )
+
+
+def cancel_request(task_id: str) -> CancelTaskRequest:
+    return CancelTaskRequest(params=TaskIdParams(id=task_id))
+
+
+async def run_in_background(manager: AgentTaskManager, task_id: str):
+    response = await manager.on_send_task(send_request(task_id))
+    assert response.result.status.state == TaskState.WORKING
+    await asyncio.gather(*manager.running_tasks.values())
+    async with manager.lock:
+        return manager.tasks[task_id]
+
+
+def test_background_run_stores_the_result():
+    manager = AgentTaskManager(
+        FakeAgent({"content": "ordered", "require_user_input": False}), None
+    )
+
+    task = asyncio.run(run_in_background(manager, "task"))
+
+    assert task.status.state == TaskState.COMPLETED
+    assert task.artifacts[0].parts[0].text == "ordered"
+
+
+def test_background_run_fails_the_task_when_the_agent_fails():
+    manager = AgentTaskManager(FakeAgent(error=RuntimeError("no menu")), None)
+
+    task = asyncio.run(run_in_background(manager, "task"))
+
+    assert task.status.state == TaskState.FAILED
+    assert "no menu" in task.status.message.parts[0].text
+
+
+def test_background_run_fails_the_task_on_a_malformed_response():
+    manager = AgentTaskManager(FakeAgent({"require_user_input": False}), None)
+
+    task = asyncio.run(run_in_background(manager, "task"))
+
+    assert task.status.state == TaskState.FAILED
+    assert "content" in task.status.message.parts[0].text
+
+
+async def collect_states(stream) -> list:
+    return [response.result.status.state async for _, response in stream]
+
+
+def test_cancel_stops_a_running_task():
+    agent = BlockingAgent()
+    notification_sender = FakeNotificationSender()
+    manager = AgentTaskManager(agent, notification_sender)
+
+    async def scenario():
+        await manager.on_send_task(send_request("task", "http://client/push"))
+        agent_run = manager.running_tasks["task"]
+        stream = await manager.on_resubscribe_to_task(
+            TaskResubscriptionRequest(params=TaskQueryParams(id="task"))
+        )
+        events = asyncio.create_task(collect_states(stream))
+        while not manager.task_sse_subscribers:
+            await asyncio.sleep(0)
+        response = await manager.on_cancel_task(cancel_request("task"))
+        agent.release.set()
+        await asyncio.gather(agent_run, return_exceptions=True)
+        return response, agent_run, await events
+
+    response, agent_run, streamed_states = asyncio.run(scenario())
+
+    assert response.result.status.state == TaskState.CANCELED
+    assert agent_run.cancelled()
+    assert manager.tasks["task"].status.state == TaskState.CANCELED
+    assert streamed_states == [TaskState.WORKING, TaskState.CANCELED]
+    assert notification_sender.states == ["working", "canceled"]
+
+
+def test_finished_tasks_are_not_cancelable():
+    manager = AgentTaskManager(
+        FakeAgent({"content": "ordered", "require_user_input": False}), None
+    )
+
+    async def scenario():
+        await run_in_background(manager, "task")
+        return await manager.on_cancel_task(cancel_request("task"))
+
+    response = asyncio.run(scenario())
+
+    assert isinstance(response.error, TaskNotCancelableError)
+    assert manager.tasks["task"].status.state == TaskState.COMPLETED
+
+
+def test_tasks_running_in_another_worker_are_not_cancelable():
+    manager = AgentTaskManager(FakeAgent(), None)
+
+    async def scenario():
+        await manager.upsert_task(send_request("task").params)
+        await manager.update_store("task", TaskStatus(state=TaskState.WORKING), None)
+        return await manager.on_cancel_task(cancel_request("task"))
+
+    response = asyncio.run(scenario())
+
+    assert isinstance(response.error, TaskNotCancelableError)
+    assert manager.tasks["task"].status.state == TaskState.WORKING
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from a2a_server.subscriber_queue import (
+    COALESCE,
+    DISCONNECT,
+    DROP_OLDEST,
+    SubscriberQueue,
+)
+from a2a_types import (
+    Artifact,
+    InternalError,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+def status(event_id: int, final: bool = False):
+    state = TaskState.COMPLETED if final else TaskState.WORKING
+    return event_id, TaskStatusUpdateEvent(
+        id="task", status=TaskStatus(state=state), final=final
+    )
+
+
+def artifact(event_id: int):
+    return event_id, TaskArtifactUpdateEvent(
+        id="task", artifact=Artifact(parts=[TextPart(text=str(event_id))])
+    )
+
+
+def event_ids(queue: SubscriberQueue) -> list:
+    return [event_id for event_id, _ in queue.items]
+
+
+def test_drop_oldest_keeps_the_latest_events():
+    queue = SubscriberQueue(2, DROP_OLDEST)
+    for item in (artifact(1), status(2), artifact(3)):
+        queue.put_nowait(item)
+
+    assert event_ids(queue) == [2, 3]
+
+
+def test_final_status_is_never_dropped():
+    queue = SubscriberQueue(2, DROP_OLDEST)
+    for item in (status(1, final=True), artifact(2), artifact(3)):
+        queue.put_nowait(item)
+
+    assert event_ids(queue) == [1, 3]
+
+
+def test_coalesce_drops_superseded_status_updates():
+    queue = SubscriberQueue(3, COALESCE)
+    for item in (status(1), artifact(2), status(3), status(4)):
+        queue.put_nowait(item)
+
+    assert event_ids(queue) == [2, 4]
+
+
+def test_coalesce_drops_the_oldest_event_without_status_updates():
+    queue = SubscriberQueue(2, COALESCE)
+    for item in (artifact(1), artifact(2), status(3)):
+        queue.put_nowait(item)
+
+    assert event_ids(queue) == [2, 3]
+
+
+def test_disconnect_replaces_the_queue_with_an_error():
+    queue = SubscriberQueue(2, DISCONNECT)
+    for item in (artifact(1), artifact(2), artifact(3), status(4, final=True)):
+        queue.put_nowait(item)
+
+    assert queue.disconnected
+    assert len(queue.items) == 1
+    assert isinstance(queue.items[0][1], InternalError)
+
+
+def test_get_waits_for_an_event():
+    async def scenario():
+        queue = SubscriberQueue(2)
+        received = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        queue.put_nowait(artifact(1))
+        return await received
+
+    assert asyncio.run(scenario())[0] == 1
+
+
+def test_rejects_an_unknown_policy():
+    with pytest.raises(ValueError):
+        SubscriberQueue(2, "block")
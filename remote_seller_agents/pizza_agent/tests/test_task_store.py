@@ -0,0 +1,55 @@
+import pytest
+
+from a2a_server.task_store import SqliteStore
+from a2a_types import Task, TaskState, TaskStatus
+
+
+def make_task(task_id: str, state: TaskState = TaskState.SUBMITTED) -> Task:
+    return Task(id=task_id, sessionId="session", status=TaskStatus(state=state))
+
+
+def test_stores_and_reads_back_models(tmp_path):
+    store = SqliteStore(str(tmp_path / "tasks.db"), "tasks", Task)
+
+    task = make_task("a")
+    store["a"] = task
+
+    assert "a" in store
+    assert store["a"] == task
+    assert store.get("b") is None
+    assert list(store) == ["a"]
+    assert len(store) == 1
+
+
+def test_values_are_copies(tmp_path):
+    store = SqliteStore(str(tmp_path / "tasks.db"), "tasks", Task)
+    store["a"] = make_task("a")
+
+    task = store["a"]
+    task.status = TaskStatus(state=TaskState.COMPLETED)
+
+    assert store["a"].status.state == TaskState.SUBMITTED
+    store["a"] = task
+    assert store["a"].status.state == TaskState.COMPLETED
+
+
+def test_delete(tmp_path):
+    store = SqliteStore(str(tmp_path / "tasks.db"), "tasks", Task)
+    store["a"] = make_task("a")
+
+    del store["a"]
+
+    assert "a" not in store
+    with pytest.raises(KeyError):
+        del store["a"]
+
+
+def test_stores_sharing_a_file_see_each_other_writes(tmp_path):
+    # As two worker processes do.
+    path = str(tmp_path / "tasks.db")
+    first = SqliteStore(path, "tasks", Task)
+    second = SqliteStore(path, "tasks", Task)
+
+    first["a"] = make_task("a", TaskState.WORKING)
+
+    assert second["a"].status.state == TaskState.WORKING
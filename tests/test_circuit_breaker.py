@@ -0,0 +1,85 @@
+import pytest
+
+import a2a_client.circuit_breaker as circuit_breaker
+from a2a_client.circuit_breaker import CircuitBreaker
+from a2a_types import A2AClientUnavailableError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_request()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("agent", failure_threshold=3, reset_timeout=10)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allows_request()
+    with pytest.raises(A2AClientUnavailableError):
+        breaker.before_request()
+
+
+def test_lets_a_single_trial_through_after_the_timeout(clock):
+    breaker = CircuitBreaker("agent", failure_threshold=2, reset_timeout=10)
+    open_breaker(breaker)
+
+    clock.now += 10
+    assert breaker.allows_request()
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(A2AClientUnavailableError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_a_failed_trial_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker("agent", failure_threshold=2, reset_timeout=10)
+    open_breaker(breaker)
+
+    clock.now += 10
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 5
+    with pytest.raises(A2AClientUnavailableError):
+        breaker.before_request()
+
+
+def test_a_trial_that_never_completes_lets_another_through(clock):
+    breaker = CircuitBreaker("agent", failure_threshold=2, reset_timeout=10)
+    open_breaker(breaker)
+
+    clock.now += 10
+    breaker.before_request()
+    clock.now += 10
+    breaker.before_request()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
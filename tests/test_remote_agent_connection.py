@@ -0,0 +1,233 @@
+import asyncio
+
+from google.adk.sessions import InMemorySessionService
+
+from a2a_client.circuit_breaker import CircuitBreaker
+from a2a_types import (
+    AgentCapabilities,
+    AgentCard,
+    CancelTaskResponse,
+    GetTaskResponse,
+    Message,
+    SendTaskResponse,
+    Task,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from purchasing_concierge.remote_agent_connection import (
+    RemoteAgentConnections,
+    Replica,
+)
+from purchasing_concierge.session_manager import ConciergeSessionManager
+
+
+class FakeClient:
+    """Answers like a seller replica, after `delay` seconds."""
+
+    def __init__(self, url: str, delay: float = 0):
+        self.url = url
+        self.delay = delay
+        self.circuit_breaker = CircuitBreaker(url)
+        self.calls = []
+        self.send_started = asyncio.Event()
+
+    async def send_task(self, payload):
+        self.calls.append("send")
+        self.send_started.set()
+        await asyncio.sleep(self.delay)
+        return SendTaskResponse(result=make_task(payload["id"], TaskState.COMPLETED))
+
+    async def get_task(self, payload):
+        self.calls.append("get")
+        await asyncio.sleep(self.delay)
+        return GetTaskResponse(result=make_task(payload["id"], TaskState.WORKING))
+
+    async def cancel_task(self, payload):
+        self.calls.append("cancel")
+        return CancelTaskResponse(result=make_task(payload["id"], TaskState.CANCELED))
+
+
+def make_task(task_id: str, state: TaskState) -> Task:
+    return Task(id=task_id, sessionId="session", status=TaskStatus(state=state))
+
+
+def make_connections(*clients, hedge_percentile=None) -> RemoteAgentConnections:
+    card = AgentCard(
+        name="test_seller_agent",
+        url="http://seller/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    connections = RemoteAgentConnections(
+        card, "http://seller/", hedge_percentile=hedge_percentile, async_tasks=False
+    )
+    connections.replicas = [Replica(client) for client in clients]
+    return connections
+
+
+def warm_up_latencies(connections, seconds: float):
+    for _ in range(connections.get_task_latency.min_samples):
+        connections.get_task_latency.record(seconds)
+
+
+def test_pick_replica_prefers_the_least_busy_one():
+    connections = make_connections(FakeClient("a"), FakeClient("b"))
+    busy, idle = connections.replicas
+    busy.outstanding = 5
+
+    assert all(connections._pick_replica() is idle for _ in range(20))
+
+
+def test_pick_replica_skips_replicas_with_an_open_circuit():
+    connections = make_connections(FakeClient("a"), FakeClient("b"), FakeClient("c"))
+    down, *_ = connections.replicas
+    down.client.circuit_breaker.state = CircuitBreaker.OPEN
+    down.client.circuit_breaker.opened_at = float("inf")
+
+    assert all(connections._pick_replica() is not down for _ in range(20))
+
+
+def test_get_task_is_not_hedged_with_a_single_replica():
+    client = FakeClient("a", delay=0.05)
+    connections = make_connections(client, hedge_percentile=50)
+    warm_up_latencies(connections, 0.001)
+
+    response = asyncio.run(connections.get_task("task"))
+
+    assert response.result.id == "task"
+    assert client.calls == ["get"]
+
+
+def test_slow_get_task_is_hedged_to_another_replica():
+    slow, fast = FakeClient("slow", delay=1), FakeClient("fast")
+    connections = make_connections(slow, fast, hedge_percentile=50)
+    connections.task_replicas["task"] = connections.replicas[0]
+    warm_up_latencies(connections, 0.01)
+
+    response = asyncio.run(connections.get_task("task"))
+
+    assert response.result.id == "task"
+    assert slow.calls == ["get"] and fast.calls == ["get"]
+
+
+def test_requests_cancelled_by_a_hedge_are_recorded_at_least_at_the_hedge_delay():
+    primary, hedge = FakeClient("primary", delay=0.06), FakeClient("hedge", delay=1)
+    connections = make_connections(primary, hedge, hedge_percentile=50)
+    connections.task_replicas["task"] = connections.replicas[0]
+    warm_up_latencies(connections, 0.05)
+
+    asyncio.run(connections.get_task("task"))
+
+    assert hedge.calls == ["get"]
+    assert min(connections.get_task_latency.samples) >= 0.05
+
+
+def send_params(task_id: str) -> TaskSendParams:
+    return TaskSendParams(
+        id=task_id,
+        sessionId="session",
+        message=Message(role="user", parts=[TextPart(text="2 burgers")]),
+    )
+
+
+async def wait_for_a_send(clients):
+    await asyncio.wait(
+        [asyncio.create_task(client.send_started.wait()) for client in clients],
+        return_when=asyncio.FIRST_COMPLETED,
+    )
+
+
+def test_cancel_during_a_send_goes_to_the_replica_running_the_task():
+    clients = [FakeClient(str(i), delay=1) for i in range(4)]
+    connections = make_connections(*clients)
+
+    async def scenario():
+        sending = asyncio.create_task(connections.send_task(send_params("task"), None))
+        await wait_for_a_send(clients)
+        await connections.cancel_session_tasks("session")
+        sending.cancel()
+
+    asyncio.run(scenario())
+
+    [sender] = [client for client in clients if "send" in client.calls]
+    assert sender.calls == ["send", "cancel"]
+    assert "task" not in connections.task_replicas
+
+
+def test_releasing_a_session_during_a_send_cancels_its_task():
+    clients = [FakeClient(str(i), delay=1) for i in range(2)]
+    connections = make_connections(*clients)
+    cancellations = []
+    manager = ConciergeSessionManager(
+        InMemorySessionService(),
+        "app",
+        on_release=lambda adk_session: cancellations.append(
+            asyncio.create_task(connections.cancel_session_tasks("session"))
+        ),
+    )
+
+    async def scenario():
+        async with manager.turn("tab"):
+            sending = asyncio.create_task(
+                connections.send_task(send_params("task"), None)
+            )
+            await wait_for_a_send(clients)
+            manager.release("tab")
+            await asyncio.gather(*cancellations)
+            sending.cancel()
+
+    asyncio.run(scenario())
+
+    [sender] = [client for client in clients if "send" in client.calls]
+    assert sender.calls == ["send", "cancel"]
+
+
+def test_a_cancelled_send_keeps_its_task_until_it_is_cancelled():
+    clients = [FakeClient(str(i), delay=1) for i in range(2)]
+    connections = make_connections(*clients)
+
+    async def scenario():
+        sending = asyncio.create_task(connections.send_task(send_params("task"), None))
+        await wait_for_a_send(clients)
+        sending.cancel()
+        await asyncio.gather(sending, return_exceptions=True)
+        assert connections.session_tasks == {"session": {"task"}}
+        await connections.cancel_session_tasks("session")
+
+    asyncio.run(scenario())
+
+    [sender] = [client for client in clients if "send" in client.calls]
+    assert sender.calls == ["send", "cancel"]
+    assert connections.session_tasks == {}
+
+
+def test_tasks_of_a_session_go_to_the_same_replica():
+    clients = [FakeClient("a"), FakeClient("b")]
+    connections = make_connections(*clients)
+
+    async def scenario():
+        for task_id in ("order", "confirm"):
+            await connections.send_task(send_params(task_id), None)
+            # The other replica looks less busy for the second task.
+            [sender] = [client for client in clients if client.calls]
+            for replica in connections.replicas:
+                replica.outstanding = 5 if replica.client is sender else 0
+
+    asyncio.run(scenario())
+
+    [sender] = [client for client in clients if client.calls]
+    assert sender.calls == ["send", "send"]
+    assert list(connections.session_replicas) == ["session"]
+
+
+def test_finished_tasks_are_forgotten():
+    connections = make_connections(FakeClient("a"), FakeClient("b"))
+
+    task = asyncio.run(connections.send_task(send_params("task"), None))
+
+    assert task.status.state == TaskState.COMPLETED
+    assert connections.task_replicas == {}
+    assert connections.session_tasks == {}
@@ -0,0 +1,124 @@
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from purchasing_concierge.session_compaction import (
+    SUMMARY_HEADER,
+    compact_contents,
+    trim_session_events,
+)
+
+APP_NAME = "app"
+USER_ID = "user"
+
+
+def user_text(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def model_text(text: str) -> types.Content:
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+def make_session(service, turns):
+    session = service.create_session(
+        app_name=APP_NAME, user_id=USER_ID, state={"session_id": "abc"}
+    )
+    for question, answer in turns:
+        service.append_event(session, Event(author="user", content=user_text(question)))
+        service.append_event(session, Event(author="agent", content=model_text(answer)))
+    return session
+
+
+def stored_texts(service, session_id):
+    session = service.get_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+    )
+    return [event.content.parts[0].text for event in session.events]
+
+
+def test_compact_contents_keeps_recent_turns_and_summarizes_older_ones():
+    contents = []
+    for i in range(5):
+        contents += [user_text(f"question {i}"), model_text(f"answer {i}")]
+
+    compacted = compact_contents(contents, max_turns=2)
+
+    assert len(compacted) == 4
+    summary = compacted[0].parts[0].text
+    assert summary.startswith(SUMMARY_HEADER)
+    assert "question 0" in summary and "answer 2" in summary
+    assert compacted[0].parts[1].text == "question 3"
+
+
+def test_compact_contents_leaves_short_conversations_unchanged():
+    contents = [user_text("hello"), model_text("hi")]
+
+    assert compact_contents(contents, max_turns=2) is contents
+
+
+def test_trim_session_events_drops_oldest_turns():
+    service = InMemorySessionService()
+    session = make_session(service, [(f"q{i}", f"a{i}") for i in range(5)])
+
+    trim_session_events(service, APP_NAME, USER_ID, session.id, max_events=4)
+
+    assert stored_texts(service, session.id) == ["q3", "a3", "q4", "a4"]
+    trimmed = service.get_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+    )
+    assert trimmed.state["session_id"] == "abc"
+
+
+def test_trim_session_events_keeps_a_bounded_number_of_confirmations():
+    service = InMemorySessionService()
+    turns = [(f"q{i}", f"Order ID {i} confirmed") for i in range(4)]
+    session = make_session(service, turns + [("q4", "a4"), ("q5", "a5")])
+
+    trim_session_events(
+        service, APP_NAME, USER_ID, session.id, max_events=4, max_pinned_turns=2
+    )
+
+    assert stored_texts(service, session.id) == [
+        "q2",
+        "Order ID 2 confirmed",
+        "q3",
+        "Order ID 3 confirmed",
+        "q4",
+        "a4",
+        "q5",
+        "a5",
+    ]
+
+
+def test_trim_session_events_does_not_replay_state_deltas():
+    service = InMemorySessionService()
+    session = make_session(service, [])
+    for i in range(3):
+        service.append_event(
+            session,
+            Event(
+                author="user",
+                content=user_text(f"q{i}"),
+                actions=EventActions(state_delta={"user:step": i}),
+            ),
+        )
+    service.append_event(
+        session,
+        Event(
+            author="agent",
+            content=model_text("done"),
+            actions=EventActions(state_delta={"user:step": 9}),
+        ),
+    )
+
+    trim_session_events(service, APP_NAME, USER_ID, session.id, max_events=2)
+
+    trimmed = service.get_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+    )
+    assert [event.content.parts[0].text for event in trimmed.events] == [
+        "q2",
+        "done",
+    ]
+    assert trimmed.state["user:step"] == 9
@@ -0,0 +1,93 @@
+import asyncio
+
+from google.adk.sessions import InMemorySessionService
+
+from purchasing_concierge.session_manager import ConciergeSessionManager
+
+APP_NAME = "app"
+
+
+def make_manager(**kwargs):
+    service = InMemorySessionService()
+    released = []
+    manager = ConciergeSessionManager(
+        session_service=service,
+        app_name=APP_NAME,
+        on_release=lambda adk_session: released.append(adk_session.id),
+        **kwargs,
+    )
+    return manager, service, released
+
+
+def adk_session(service, session):
+    return service.get_session(
+        app_name=APP_NAME, user_id=session.user_id, session_id=session.session_id
+    )
+
+
+def test_acquire_returns_the_same_session_per_client():
+    manager, service, _ = make_manager()
+
+    first = manager.acquire("a")
+
+    assert manager.acquire("a") is first
+    assert manager.acquire("b") is not first
+    assert adk_session(service, first) is not None
+
+
+def test_least_recently_used_session_is_evicted_when_full():
+    manager, service, released = make_manager(max_sessions=2)
+    a = manager.acquire("a")
+    b = manager.acquire("b")
+    manager.acquire("a")
+
+    manager.acquire("c")
+
+    assert list(manager.sessions) == ["a", "c"]
+    assert released == [b.session_id]
+    assert adk_session(service, b) is None
+    assert adk_session(service, a) is not None
+
+
+def test_idle_sessions_are_evicted():
+    manager, _, released = make_manager(idle_timeout=60)
+    a = manager.acquire("a")
+    a.last_used -= 120
+
+    manager.acquire("b")
+
+    assert list(manager.sessions) == ["b"]
+    assert released == [a.session_id]
+
+
+def test_release_during_a_turn_deletes_the_session_once_the_turn_ends():
+    manager, service, released = make_manager()
+
+    async def scenario():
+        async with manager.turn("a") as session:
+            manager.release("a")
+            assert session.closing
+            assert adk_session(service, session) is not None
+            # Notified at once, so that the work of the turn can be cancelled.
+            assert released == [session.session_id]
+        return session
+
+    session = asyncio.run(scenario())
+
+    assert "a" not in manager.sessions
+    assert released == [session.session_id, session.session_id]
+    assert adk_session(service, session) is None
+
+
+def test_busy_sessions_are_not_evicted():
+    manager, _, released = make_manager(max_sessions=1, idle_timeout=60)
+
+    async def scenario():
+        async with manager.turn("a") as session:
+            session.last_used -= 120
+            manager.acquire("b")
+            assert "a" in manager.sessions
+
+    asyncio.run(scenario())
+
+    assert released == []
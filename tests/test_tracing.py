@@ -0,0 +1,33 @@
+import json
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+
+import a2a_client.tracing as client_tracing
+from purchasing_concierge.tracing import _json_lines_file_exporter
+
+
+def test_client_tracing_is_a_no_op_without_opentelemetry(monkeypatch):
+    monkeypatch.setattr(client_tracing, "trace", None)
+    monkeypatch.setattr(client_tracing, "propagate", None)
+
+    with client_tracing.start_client_span("a2a.client tasks/get") as span:
+        headers = client_tracing.inject_context({"Authorization": "Bearer x"})
+
+    assert span is None
+    assert headers == {"Authorization": "Bearer x"}
+
+
+def test_traces_file_gets_json_lines_and_is_closed_on_shutdown(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = _json_lines_file_exporter(ConsoleSpanExporter, str(path))
+    provider = TracerProvider(shutdown_on_exit=False)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    with provider.get_tracer(__name__).start_as_current_span("purchase"):
+        pass
+    provider.shutdown()
+
+    assert exporter.file.closed
+    [line] = path.read_text().splitlines()
+    assert json.loads(line)["name"] == "purchase"